@@ -27,9 +27,76 @@ class Settings:
     
     # YouTube Data API
     YOUTUBE_API_KEY: str = os.getenv("YOUTUBE_API_KEY", "")
+    YOUTUBE_API_BASE_URL: str = os.getenv("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3")
+    YOUTUBE_TIMEOUT_SECONDS: float = float(os.getenv("YOUTUBE_TIMEOUT_SECONDS", "5"))
+    YOUTUBE_MAX_CONNECTIONS: int = int(os.getenv("YOUTUBE_MAX_CONNECTIONS", "20"))
+    # Search result cache: in-process LRU, backed by the youtube_videos/youtube_queries tables
+    YOUTUBE_CACHE_ENABLED: bool = os.getenv("YOUTUBE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    YOUTUBE_CACHE_PERSIST: bool = os.getenv("YOUTUBE_CACHE_PERSIST", "true").lower() in ("1", "true", "yes")
+    YOUTUBE_CACHE_TTL_SECONDS: int = int(os.getenv("YOUTUBE_CACHE_TTL_SECONDS", str(6 * 3600)))
+    YOUTUBE_CACHE_MAX_ENTRIES: int = int(os.getenv("YOUTUBE_CACHE_MAX_ENTRIES", "1024"))
+    # videos.list enrichment (duration, view/like counts, tags)
+    YOUTUBE_ENRICHMENT_ENABLED: bool = os.getenv("YOUTUBE_ENRICHMENT_ENABLED", "true").lower() in ("1", "true", "yes")
+    YOUTUBE_ENRICHMENT_MAX_AGE_SECONDS: int = int(os.getenv("YOUTUBE_ENRICHMENT_MAX_AGE_SECONDS", str(24 * 3600)))
+    YOUTUBE_ENRICHMENT_BATCH_WINDOW_SECONDS: float = float(os.getenv("YOUTUBE_ENRICHMENT_BATCH_WINDOW_SECONDS", "0.02"))
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./test.db")
+    # Per-process pool; with N uvicorn workers the server sees up to N * (size + overflow) connections
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_CONNECT_TIMEOUT_SECONDS: int = int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "10"))
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+    # SQLite file databases: write-ahead log lets readers proceed during a write
+    SQLITE_WAL: bool = os.getenv("SQLITE_WAL", "true").lower() in ("1", "true", "yes")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    
+    # Catalog
+    CATALOG_PATH: str = os.getenv(
+        "CATALOG_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "catalog.json"),
+    )
+    # Free-text catalog search: 0 keeps the sparse TF-IDF index, N > 0 uses an N-dim SVD projection
+    # (ANN_ENABLED below only applies to the SVD index)
+    TEXT_INDEX_COMPONENTS: int = int(os.getenv("TEXT_INDEX_COMPONENTS", "0"))
+    
+    # Questionnaire profile scores: LRU bounds (entries, and megabytes of score arrays) and the
+    # file the warm-up job precomputes into
+    PROFILE_CACHE_MAX_ENTRIES: int = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "4096"))
+    PROFILE_CACHE_MAX_MB: int = int(os.getenv("PROFILE_CACHE_MAX_MB", "256"))
+    PROFILE_CACHE_PATH: str = os.getenv(
+        "PROFILE_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "profiles.joblib"),
+    )
+    
+    # Questionnaire display scoring: the largest per-item bonus (0 disables it) and the salt of its
+    # hash; the bonus is fixed per (profile, item), so repeated profiles get identical results
+    RECOMMENDATION_JITTER: int = int(os.getenv("RECOMMENDATION_JITTER", "10"))
+    RECOMMENDATION_JITTER_SEED: str = os.getenv("RECOMMENDATION_JITTER_SEED", "")
+    
+    # Item-item collaborative filtering: co-occurrence state carried between incremental runs
+    COLLABORATIVE_STATE_PATH: str = os.getenv(
+        "COLLABORATIVE_STATE_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "collaborative.joblib"),
+    )
+    
+    # Hybrid ranking: weights of the content, collaborative and popularity signals
+    HYBRID_CONTENT_WEIGHT: float = float(os.getenv("HYBRID_CONTENT_WEIGHT", "0.5"))
+    HYBRID_COLLABORATIVE_WEIGHT: float = float(os.getenv("HYBRID_COLLABORATIVE_WEIGHT", "0.4"))
+    HYBRID_POPULARITY_WEIGHT: float = float(os.getenv("HYBRID_POPULARITY_WEIGHT", "0.1"))
+    
+    # Approximate nearest-neighbor search over the dense (SVD) text index; needs
+    # TEXT_INDEX_COMPONENTS > 0, the sparse index ignores it with a warning
+    ANN_ENABLED: bool = os.getenv("ANN_ENABLED", "false").lower() in ("1", "true", "yes")
+    ANN_BACKEND: str = os.getenv("ANN_BACKEND", "ivf")  # "ivf" or "brute" (exact)
+    ANN_N_LISTS: int = int(os.getenv("ANN_N_LISTS", "0"))  # 0 picks sqrt(catalog size)
+    ANN_N_PROBE: int = int(os.getenv("ANN_N_PROBE", "8"))
+    
+    # Instrumentation: latency histograms and cache/pool gauges at /metrics; false makes it all a no-op
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
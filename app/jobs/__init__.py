@@ -0,0 +1 @@
+# Offline jobs package
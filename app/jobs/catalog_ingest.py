@@ -0,0 +1,103 @@
+"""
+Load ``data/catalog.json`` into the ``assessments`` table.
+
+Items are upserted in batches with one executemany INSERT ... ON CONFLICT
+per batch and one transaction per batch, keyed on the catalog ``id``
+(stored in ``assessments.catalog_id``). Re-running is idempotent: unchanged
+items are not rewritten, so their ``updated_at`` stays put and
+``item_similarity --since`` only sees real edits.
+
+    python -m app.jobs.catalog_ingest
+    python -m app.jobs.catalog_ingest --catalog data/catalog.json --batch-size 5000
+"""
+import argparse
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import models
+from ..models.database import SessionLocal, bulk_upsert, engine
+from ..models.migrations import upgrade
+from ..models.schemas import DifficultyLevel
+from ..services.catalog_cache import catalog_cache
+
+DEFAULT_BATCH_SIZE = 5000
+# The catalog carries no exam settings; ingested items get these until edited
+DEFAULT_DURATION_MINUTES = 30
+DEFAULT_PASSING_SCORE = 70.0
+
+# Columns owned by the catalog file; duration, passing score and questions are authored in the app
+CATALOG_COLUMNS = ["title", "description", "category", "difficulty", "tags", "is_active"]
+DIFFICULTIES = {level.value for level in DifficultyLevel}
+
+
+class IngestResult(NamedTuple):
+    rows: int
+    batches: int
+    seconds: float
+
+
+def assessment_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    difficulty = item["difficulty"].lower()
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"Catalog item {item['id']!r} has unknown difficulty {item['difficulty']!r}")
+    return {
+        "catalog_id": item["id"],
+        "title": item["title"],
+        "description": item.get("description"),
+        "category": item["category"],
+        "difficulty": difficulty,
+        "tags": list(item.get("tags") or []),
+        "is_active": True,
+        "duration_minutes": DEFAULT_DURATION_MINUTES,
+        "passing_score": DEFAULT_PASSING_SCORE,
+        "questions": [],
+    }
+
+
+def batches(items: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for item in items:
+        batch.append(assessment_row(item))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest(db: Session, items: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> IngestResult:
+    """Upsert catalog ``items`` into ``assessments``, committing after each batch."""
+    start = time.perf_counter()
+    rows = n_batches = 0
+    for batch in batches(items, batch_size):
+        # Later duplicates of a catalog id win, as a second upsert would
+        batch = list({row["catalog_id"]: row for row in batch}.values())
+        bulk_upsert(db, models.Assessment, batch, key_columns=["catalog_id"],
+                    update_columns=CATALOG_COLUMNS, skip_unchanged=True)
+        db.commit()
+        rows += len(batch)
+        n_batches += 1
+    return IngestResult(rows=rows, batches=n_batches, seconds=time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Upsert the catalog into the assessments table")
+    parser.add_argument("--catalog", default=settings.CATALOG_PATH)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT and per transaction")
+    args = parser.parse_args(argv)
+
+    upgrade(engine)
+    db = SessionLocal()
+    try:
+        result = ingest(db, catalog_cache.get_catalog(args.catalog), args.batch_size)
+    finally:
+        db.close()
+    print(f"Upserted {result.rows} catalog items in {result.batches} batches "
+          f"({result.seconds:.2f}s, {result.rows / max(result.seconds, 1e-9):.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Offline job: item-item collaborative filtering from completion history.
+
+Completions in ``user_assessments`` form a binary user x assessment matrix
+``X``; ``X.T @ X`` gives how many users completed each pair of assessments
+(its diagonal is each assessment's completion count). Neighbors are ranked
+by cosine similarity, ``co(i, j) / sqrt(n_i * n_j)``, and the top-N per
+assessment are written to ``recommendations`` with
+``source="collaborative"``.
+
+The co-occurrence matrix and the last ``user_assessments.id`` folded in
+are persisted between runs. An incremental run reads only the users with
+new completions, adds their change to the co-occurrence counts and
+rewrites just the neighbor lists whose scores moved. Changes to
+``is_active`` are picked up by the next ``--rebuild``.
+
+    python -m app.jobs.collaborative             # incremental (rebuilds on the first run)
+    python -m app.jobs.collaborative --rebuild
+"""
+import argparse
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import models
+from ..models.database import SessionLocal, engine
+from ..models.migrations import upgrade
+from ..services.ann_index import top_k
+from ..services.recommendation_service import COLLABORATIVE_SOURCE
+from .item_similarity import DEFAULT_TOP_N, _delete_neighbors
+
+COLLABORATIVE_REASON = "Often completed together"
+# Pairs completed together by fewer users than this are treated as noise
+DEFAULT_MIN_SUPPORT = 2
+FORMAT_VERSION = 1
+
+
+class CooccurrenceState:
+    """Co-occurrence counts indexed by assessment id, plus the history watermark."""
+
+    def __init__(self, cooccurrence: sparse.csr_matrix, counts: np.ndarray, watermark: int):
+        self.cooccurrence = cooccurrence
+        self.counts = counts
+        self.watermark = watermark
+
+    @classmethod
+    def from_completions(cls, X: sparse.csr_matrix, watermark: int) -> "CooccurrenceState":
+        cooccurrence, counts = _cooccurrence(X)
+        return cls(cooccurrence, counts, watermark)
+
+    def grow(self, n_items: int) -> None:
+        if n_items > len(self.counts):
+            self.cooccurrence.resize((n_items, n_items))
+            self.counts = np.pad(self.counts, (0, n_items - len(self.counts)))
+
+    def save(self, path: str) -> None:
+        state = {
+            "version": FORMAT_VERSION,
+            "cooccurrence": self.cooccurrence,
+            "counts": self.counts,
+            "watermark": self.watermark,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CooccurrenceState":
+        state = joblib.load(path)
+        if state.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} has an unsupported collaborative state version")
+        return cls(state["cooccurrence"], state["counts"], state["watermark"])
+
+
+def _cooccurrence(X: sparse.csr_matrix) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    product = (X.T @ X).tocsr()
+    counts = product.diagonal().astype(np.int64)
+    product.setdiag(0)
+    product.eliminate_zeros()
+    return product, counts
+
+
+def completion_matrix(
+    pairs: Sequence[Tuple[int, int]], n_items: int, users: Optional[np.ndarray] = None,
+) -> sparse.csr_matrix:
+    """
+    Binary matrix with one row per user (in ``users`` order when given) and
+    one column per assessment id; repeat completions count once.
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if users is None:
+        users = np.unique(pairs[:, 0])
+    rows = np.searchsorted(users, pairs[:, 0])
+    X = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.int32), (rows, pairs[:, 1])),
+        shape=(len(users), n_items),
+    )
+    X.data[:] = 1  # duplicates were summed on construction
+    return X
+
+
+def _completions(db: Session, max_id: int, user_ids: Optional[Iterable[int]] = None) -> List[Tuple[int, int]]:
+    query = db.query(models.UserAssessment.user_id, models.UserAssessment.assessment_id).filter(
+        models.UserAssessment.id <= max_id
+    )
+    if user_ids is None:
+        return [tuple(row) for row in query.distinct()]
+    pairs: List[Tuple[int, int]] = []
+    user_ids = list(user_ids)
+    for start in range(0, len(user_ids), 500):
+        chunk = user_ids[start:start + 500]
+        pairs.extend(tuple(row) for row in query.filter(models.UserAssessment.user_id.in_(chunk)).distinct())
+    return pairs
+
+
+def _active_mask(db: Session, n_items: int) -> np.ndarray:
+    mask = np.zeros(n_items, dtype=bool)
+    ids = [row.id for row in db.query(models.Assessment.id).filter(models.Assessment.is_active.is_(True))]
+    mask[[i for i in ids if i < n_items]] = True
+    return mask
+
+
+def _n_items(db: Session) -> int:
+    max_assessment = db.query(func.max(models.Assessment.id)).scalar() or 0
+    max_completed = db.query(func.max(models.UserAssessment.assessment_id)).scalar() or 0
+    return max(max_assessment, max_completed) + 1
+
+
+def top_neighbors(
+    state: CooccurrenceState,
+    rows: Iterable[int],
+    top_n: int,
+    min_support: int,
+    active: np.ndarray,
+) -> Iterator[Tuple[int, List[Tuple[int, float]]]]:
+    """Yield ``(assessment_id, [(neighbor_id, cosine), ...])`` best first, ties by id."""
+    C, counts = state.cooccurrence, state.counts
+    for i in rows:
+        start, end = C.indptr[i], C.indptr[i + 1]
+        cols, together = C.indices[start:end], C.data[start:end]
+        keep = (together >= min_support) & active[cols]
+        cols, together = cols[keep], together[keep]
+        neighbors, scores = top_k(together / np.sqrt(float(counts[i]) * counts[cols]), cols, top_n)
+        yield int(i), [(int(col), float(score)) for col, score in zip(neighbors, scores)]
+
+
+def _recommendation_rows(neighbors: Iterable[Tuple[int, List[Tuple[int, float]]]]) -> List[Dict]:
+    return [
+        {
+            "assessment_id": row,
+            "recommended_assessment_id": col,
+            "score": score,
+            "reason": COLLABORATIVE_REASON,
+            "source": COLLABORATIVE_SOURCE,
+        }
+        for row, cols in neighbors
+        for col, score in cols
+    ]
+
+
+def _write(db: Session, state: CooccurrenceState, rows: Sequence[int], top_n: int, min_support: int,
+           full: bool) -> int:
+    active = _active_mask(db, len(state.counts))
+    scored = [row for row in rows if active[row]]
+    recommendations = _recommendation_rows(top_neighbors(state, scored, top_n, min_support, active))
+    _delete_neighbors(db, None if full else [int(row) for row in rows], source=COLLABORATIVE_SOURCE)
+    if recommendations:
+        db.execute(insert(models.Recommendation), recommendations)
+    db.commit()
+    return len(recommendations)
+
+
+def rebuild(
+    db: Session,
+    top_n: int = DEFAULT_TOP_N,
+    min_support: int = DEFAULT_MIN_SUPPORT,
+    state_path: Optional[str] = None,
+) -> int:
+    """Recompute every collaborative neighbor list from the full history. Returns rows written."""
+    state_path = state_path or settings.COLLABORATIVE_STATE_PATH
+    watermark = db.query(func.max(models.UserAssessment.id)).scalar() or 0
+    n_items = _n_items(db)
+    state = CooccurrenceState.from_completions(completion_matrix(_completions(db, watermark), n_items), watermark)
+    written = _write(db, state, np.flatnonzero(state.counts), top_n, min_support, full=True)
+    state.save(state_path)
+    return written
+
+
+def update(
+    db: Session,
+    top_n: int = DEFAULT_TOP_N,
+    min_support: int = DEFAULT_MIN_SUPPORT,
+    state_path: Optional[str] = None,
+) -> int:
+    """
+    Fold completions recorded since the last run into the stored state and
+    rewrite only the neighbor lists they change. Returns rows written.
+    """
+    state_path = state_path or settings.COLLABORATIVE_STATE_PATH
+    try:
+        state = CooccurrenceState.load(state_path)
+    except (OSError, ValueError):
+        return rebuild(db, top_n, min_support, state_path)
+
+    watermark = db.query(func.max(models.UserAssessment.id)).scalar() or 0
+    if watermark <= state.watermark:
+        return 0
+
+    users = np.array(sorted(
+        row.user_id for row in db.query(models.UserAssessment.user_id)
+        .filter(models.UserAssessment.id > state.watermark, models.UserAssessment.id <= watermark)
+        .distinct()
+    ), dtype=np.int64)
+    n_items = _n_items(db)
+    state.grow(n_items)
+
+    # Only these users' rows of X changed, so the change to X.T @ X is theirs alone
+    before = completion_matrix(_completions(db, state.watermark, users.tolist()), n_items, users)
+    after = completion_matrix(_completions(db, watermark, users.tolist()), n_items, users)
+    added, added_counts = _cooccurrence(after)
+    removed, removed_counts = _cooccurrence(before)
+    delta = (added - removed).tocsr()
+    delta.eliminate_zeros()
+    delta_counts = added_counts - removed_counts
+
+    state.cooccurrence = (state.cooccurrence + delta).tocsr()
+    state.counts = state.counts + delta_counts
+    state.watermark = watermark
+
+    # Lists with a changed pair count, plus every list holding an item whose completion count moved
+    changed_items = np.flatnonzero(delta_counts)
+    affected = set(np.unique(delta.nonzero()[0]).tolist()) | set(changed_items.tolist())
+    if len(changed_items):
+        affected.update(np.unique(state.cooccurrence[changed_items].indices).tolist())
+
+    written = _write(db, state, sorted(affected), top_n, min_support, full=False)
+    state.save(state_path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute collaborative-filtering assessment neighbors")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N, help="Neighbors to keep per assessment")
+    parser.add_argument("--min-support", type=int, default=DEFAULT_MIN_SUPPORT,
+                        help="Minimum users who completed both assessments")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute from the full history")
+    parser.add_argument("--state", default=settings.COLLABORATIVE_STATE_PATH, help="Co-occurrence state file")
+    args = parser.parse_args(argv)
+
+    upgrade(engine)
+    db = SessionLocal()
+    try:
+        if args.rebuild:
+            written = rebuild(db, args.top_n, args.min_support, args.state)
+            print(f"Wrote {written} collaborative recommendations")
+        else:
+            written = update(db, args.top_n, args.min_support, args.state)
+            print(f"Rewrote {written} collaborative recommendations from new completions")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Offline job: precompute content-based neighbors for every assessment.
+
+Assessments are vectorized with TF-IDF over title, description, category
+and tags; the top-N cosine neighbors of each one are bulk-written to the
+``recommendations`` table with ``source="content"``, so serving a
+recommendation is a single indexed read.
+
+    python -m app.jobs.item_similarity                 # full rebuild
+    python -m app.jobs.item_similarity --since 2025-12-01T00:00:00
+    python -m app.jobs.item_similarity --ids 4 8 15
+"""
+import argparse
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import Session
+
+from ..models import models
+from ..models.database import SessionLocal, engine
+from ..models.migrations import upgrade
+from ..services.recommendation_service import CONTENT_SOURCE
+
+CONTENT_REASON = "Similar content"
+DEFAULT_TOP_N = 10
+BLOCK_ELEMENTS = 1 << 24  # ~128 MB of float64 similarities per block
+DELETE_CHUNK = 500
+
+
+def assessment_text(title: str, description: Optional[str], category: Optional[str], tags: Optional[List[str]]) -> str:
+    return " ".join(filter(None, [title, description, category, " ".join(tags or [])]))
+
+
+def load_corpus(db: Session) -> Tuple[List[int], object]:
+    """Return active assessment ids and their L2-normalized TF-IDF matrix."""
+    rows = (
+        db.query(
+            models.Assessment.id,
+            models.Assessment.title,
+            models.Assessment.description,
+            models.Assessment.category,
+            models.Assessment.tags,
+        )
+        .filter(models.Assessment.is_active.is_(True))
+        .order_by(models.Assessment.id)
+        .all()
+    )
+    ids = [row.id for row in rows]
+    if not rows:
+        return ids, None
+    texts = [assessment_text(row.title, row.description, row.category, row.tags) for row in rows]
+    # TF-IDF rows are L2-normalized, so a dot product is the cosine similarity
+    matrix = TfidfVectorizer(stop_words="english").fit_transform(texts)
+    return ids, matrix
+
+
+def top_neighbors(matrix, rows: Sequence[int], top_n: int) -> Iterator[Tuple[int, List[Tuple[int, float]]]]:
+    """
+    Yield ``(row, [(neighbor_row, score), ...])`` for each requested row.
+
+    Similarities are computed a block of rows at a time and reduced with
+    argpartition, so memory stays bounded by ``BLOCK_ELEMENTS``.
+    """
+    n_items = matrix.shape[0]
+    block_size = max(1, BLOCK_ELEMENTS // max(n_items, 1))
+    k = min(top_n, n_items - 1)
+    if k <= 0:
+        for row in rows:
+            yield row, []
+        return
+
+    for start in range(0, len(rows), block_size):
+        block = np.asarray(rows[start:start + block_size])
+        sims = (matrix[block] @ matrix.T).toarray()
+        sims[np.arange(len(block)), block] = -1.0  # never recommend an assessment to itself
+        candidates = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        for i, row in enumerate(block):
+            cols = candidates[i][np.argsort(-sims[i, candidates[i]], kind="stable")]
+            yield int(row), [(int(col), float(sims[i, col])) for col in cols if sims[i, col] > 0]
+
+
+def _recommendation_rows(ids: List[int], neighbors: Iterable[Tuple[int, List[Tuple[int, float]]]]) -> List[Dict]:
+    return [
+        {
+            "assessment_id": ids[row],
+            "recommended_assessment_id": ids[col],
+            "score": score,
+            "reason": CONTENT_REASON,
+            "source": CONTENT_SOURCE,
+        }
+        for row, cols in neighbors
+        for col, score in cols
+    ]
+
+
+def _delete_neighbors(db: Session, assessment_ids: Optional[Iterable[int]] = None, source: str = CONTENT_SOURCE) -> None:
+    query = delete(models.Recommendation).where(models.Recommendation.source == source)
+    if assessment_ids is None:
+        db.execute(query)
+        return
+    assessment_ids = list(assessment_ids)
+    for start in range(0, len(assessment_ids), DELETE_CHUNK):
+        chunk = assessment_ids[start:start + DELETE_CHUNK]
+        db.execute(query.where(models.Recommendation.assessment_id.in_(chunk)))
+
+
+def rebuild(db: Session, top_n: int = DEFAULT_TOP_N) -> int:
+    """Recompute neighbors for every assessment in one transaction. Returns rows written."""
+    ids, matrix = load_corpus(db)
+    rows = _recommendation_rows(ids, top_neighbors(matrix, range(len(ids)), top_n)) if ids else []
+
+    _delete_neighbors(db)
+    if rows:
+        db.execute(insert(models.Recommendation), rows)
+    db.commit()
+    return len(rows)
+
+
+def update(db: Session, changed_ids: Iterable[int], top_n: int = DEFAULT_TOP_N) -> int:
+    """
+    Refresh neighbors after ``changed_ids`` were added, edited or deactivated.
+
+    Similarity is symmetric, so only the changed assessments and the ones
+    whose current top-N they enter or leave need their lists rewritten;
+    everything else keeps its stored neighbors. IDF weights drift slightly
+    between full rebuilds, which a periodic ``rebuild`` corrects.
+    """
+    changed_ids = set(changed_ids)
+    ids, matrix = load_corpus(db)
+    position = {assessment_id: pos for pos, assessment_id in enumerate(ids)}
+
+    # Lists that currently point at a changed assessment may lose or reorder it
+    affected: Set[int] = set(changed_ids)
+    if changed_ids:
+        pointing = (
+            db.query(models.Recommendation.assessment_id)
+            .filter(
+                models.Recommendation.source == CONTENT_SOURCE,
+                models.Recommendation.recommended_assessment_id.in_(changed_ids),
+            )
+            .distinct()
+        )
+        affected.update(row.assessment_id for row in pointing)
+
+    # Lists a changed assessment now scores high enough to enter
+    changed_rows = [position[assessment_id] for assessment_id in changed_ids if assessment_id in position]
+    if changed_rows:
+        floors = {
+            row.assessment_id: (row.min_score, row.count)
+            for row in db.query(
+                models.Recommendation.assessment_id,
+                func.min(models.Recommendation.score).label("min_score"),
+                func.count().label("count"),
+            )
+            .filter(models.Recommendation.source == CONTENT_SOURCE)
+            .group_by(models.Recommendation.assessment_id)
+        }
+        sims = (matrix[changed_rows] @ matrix.T).max(axis=0).toarray().ravel()
+        for pos, assessment_id in enumerate(ids):
+            min_score, count = floors.get(assessment_id, (0.0, 0))
+            if sims[pos] > 0 and (count < top_n or sims[pos] > min_score):
+                affected.add(assessment_id)
+
+    rows_to_score = sorted(position[assessment_id] for assessment_id in affected if assessment_id in position)
+    rows = _recommendation_rows(ids, top_neighbors(matrix, rows_to_score, top_n)) if rows_to_score else []
+
+    _delete_neighbors(db, affected)
+    if rows:
+        db.execute(insert(models.Recommendation), rows)
+    db.commit()
+    return len(rows)
+
+
+def changed_since(db: Session, since: datetime) -> List[int]:
+    changed_at = func.coalesce(models.Assessment.updated_at, models.Assessment.created_at)
+    return [row.id for row in db.query(models.Assessment.id).filter(changed_at >= since)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute content-based assessment neighbors")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N, help="Neighbors to keep per assessment")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None,
+                        help="Only refresh assessments changed at or after this ISO timestamp")
+    parser.add_argument("--ids", type=int, nargs="+", default=None, help="Only refresh these assessment ids")
+    args = parser.parse_args(argv)
+
+    upgrade(engine)
+    db = SessionLocal()
+    try:
+        if args.ids or args.since:
+            changed = set(args.ids or []) | set(changed_since(db, args.since) if args.since else [])
+            written = update(db, changed, args.top_n)
+            print(f"Refreshed neighbors for {len(changed)} changed assessments ({written} rows)")
+        else:
+            written = rebuild(db, args.top_n)
+            print(f"Wrote {written} content-based recommendations")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
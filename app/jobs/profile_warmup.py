@@ -0,0 +1,66 @@
+"""
+Precompute scores for the most common questionnaire profiles.
+
+Profiles are counted from a candidates CSV (``expertise`` and the
+``;``-separated ``languages`` columns, as read by ``generate_predictions``),
+canonicalized the way ``ProfileCache`` keys them, and the top ``--top``
+are scored against the current catalog and written to
+``PROFILE_CACHE_PATH``. The API and the Streamlit app seed their profile
+cache from that file, so the common profiles are served from memory from
+the first request. Pass ``--position-levels`` to warm each profile at
+those questionnaire levels too.
+
+    python -m app.jobs.profile_warmup --candidates test_candidates.csv --top 500
+    python -m app.jobs.profile_warmup --position-levels Entry,Mid,Senior,Executive
+"""
+import argparse
+import csv
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence
+
+from ..config import settings
+from ..services.catalog_cache import catalog_cache
+from ..services.profile_cache import Profile, canonical_profile, save_profiles, score_profile
+
+DEFAULT_TOP = 500
+
+
+def candidate_profiles(rows: Iterable[dict], position_levels: Sequence[Optional[str]] = (None,)) -> Counter:
+    """Count canonical profiles in candidate rows, once per requested position level."""
+    counts: Counter = Counter()
+    for row in rows:
+        skills = [skill for skill in (row.get("languages") or "").split(";") if skill]
+        for position_level in position_levels:
+            counts[canonical_profile(row.get("expertise"), skills, position_level)] += 1
+    return counts
+
+
+def precompute(catalog_path: str, profiles: Sequence[Profile], state_path: str) -> int:
+    """Score ``profiles`` (most common first) against the catalog and save them. Returns the count."""
+    entry = catalog_cache.get(catalog_path)
+    entries = {profile: score_profile(entry.index, profile) for profile in profiles}
+    save_profiles(state_path, entry.key, entries)
+    return len(entries)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Precompute scores for the most common questionnaire profiles")
+    parser.add_argument("--catalog", default=settings.CATALOG_PATH)
+    parser.add_argument("--candidates", default="test_candidates.csv", help="CSV to count profiles from")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Number of profiles to precompute")
+    parser.add_argument("--position-levels", default="", help="Comma-separated levels to warm each profile at")
+    parser.add_argument("--output", default=settings.PROFILE_CACHE_PATH)
+    args = parser.parse_args(argv)
+
+    levels = [level.strip() for level in args.position_levels.split(",") if level.strip()] or [None]
+    with open(args.candidates, newline="") as f:
+        counts = candidate_profiles(csv.DictReader(f), levels)
+    top = [profile for profile, _ in counts.most_common(args.top)]
+    written = precompute(args.catalog, top, args.output)
+    covered = sum(counts[profile] for profile in top)
+    print(f"Precomputed {written} of {len(counts)} distinct profiles, "
+          f"covering {covered}/{sum(counts.values())} observed answers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Scheduled job: warm the YouTube search cache for every catalog entry.
+
+Each entry's preview search (its title plus leading tags, see
+``catalog_query``) is issued with bounded concurrency and a request rate
+limit, and the results are written through ``YouTubeSearchCache`` to the
+database, so render-time lookups are local reads. Searches cost 100 quota
+units each; the job stops once the next search would exceed ``--quota``.
+Entries whose results are already cached and fresh are skipped at no cost,
+so an interrupted or quota-limited run resumes where it left off.
+
+    python -m app.jobs.youtube_warmup --quota 10000 --concurrency 4 --rate 5
+"""
+import argparse
+import asyncio
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from ..config import settings
+from ..models.database import engine
+from ..models.migrations import upgrade
+from ..services.catalog_cache import catalog_cache
+from ..services.youtube_cache import YouTubeSearchCache, catalog_query
+from ..services.youtube_enrichment import VideoEnricher
+from ..services.youtube_service import YouTubeService
+
+# YouTube Data API quota costs, in units
+SEARCH_QUOTA_COST = 100
+VIDEOS_QUOTA_COST = 1
+DEFAULT_QUOTA = 10000  # Default daily allowance of a project
+DEFAULT_MAX_RESULTS = 5
+
+
+class WarmupResult(NamedTuple):
+    warmed: int
+    skipped: int
+    failed: int
+    remaining: int
+    quota_used: int
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across all callers."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = max(self._next, loop.time()) + self.interval
+
+
+class QuotaBudget:
+    def __init__(self, units: int):
+        self.units = units
+        self.used = 0
+
+    def spend(self, cost: int) -> bool:
+        """Reserve ``cost`` units; False once the budget cannot cover it."""
+        if self.used + cost > self.units:
+            return False
+        self.used += cost
+        return True
+
+
+async def warm_catalog(
+    catalog: Sequence[Dict[str, Any]],
+    service: YouTubeService,
+    cache: YouTubeSearchCache,
+    enricher: Optional[VideoEnricher] = None,
+    max_results: int = DEFAULT_MAX_RESULTS,
+    quota: int = DEFAULT_QUOTA,
+    concurrency: int = 4,
+    rate: float = 5.0,
+) -> WarmupResult:
+    """
+    Search and cache previews for each catalog entry in catalog order.
+
+    ``service`` should be constructed without a cache: the job checks
+    ``cache`` itself so already-warm entries are counted as skipped.
+    """
+    queries: List[str] = list(dict.fromkeys(catalog_query(item) for item in catalog))
+    budget = QuotaBudget(quota)
+    limiter = RateLimiter(rate)
+    cost = SEARCH_QUOTA_COST + (VIDEOS_QUOTA_COST if enricher is not None else 0)
+    counts = {"warmed": 0, "skipped": 0, "failed": 0}
+    position = 0
+    exhausted = False
+
+    async def worker():
+        nonlocal position, exhausted
+        while not exhausted and position < len(queries):
+            query = queries[position]
+            position += 1
+            if await cache.get(query, max_results) is not None:
+                counts["skipped"] += 1
+                continue
+            if not budget.spend(cost):
+                # This and every later entry are left for the next run
+                exhausted = True
+                break
+            await limiter.wait()
+            try:
+                videos = await service.search_videos(query, max_results, fallback=False)
+                if enricher is not None:
+                    videos = await enricher.enrich(videos)
+                await cache.set(query, max_results, videos)
+                counts["warmed"] += 1
+            except Exception as e:
+                print(f"Warm-up failed for {query!r}: {e}")
+                counts["failed"] += 1
+
+    await asyncio.gather(*[worker() for _ in range(max(1, concurrency))])
+    if enricher is not None:
+        await enricher.aclose()
+    remaining = len(queries) - sum(counts.values())
+    return WarmupResult(remaining=remaining, quota_used=budget.used, **counts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prefetch YouTube previews for every catalog entry")
+    parser.add_argument("--catalog", default=settings.CATALOG_PATH)
+    parser.add_argument("--max-results", type=int, default=DEFAULT_MAX_RESULTS)
+    parser.add_argument("--quota", type=int, default=DEFAULT_QUOTA, help="Quota units this run may spend")
+    parser.add_argument("--concurrency", type=int, default=4, help="Searches in flight at once")
+    parser.add_argument("--rate", type=float, default=5.0, help="Maximum searches started per second")
+    parser.add_argument("--no-enrich", action="store_true", help="Skip videos.list enrichment")
+    args = parser.parse_args(argv)
+
+    if not settings.YOUTUBE_API_KEY:
+        parser.error("YOUTUBE_API_KEY is not set")
+
+    upgrade(engine)
+    catalog = catalog_cache.get_catalog(args.catalog)
+    cache = YouTubeSearchCache(
+        maxsize=len(catalog) or 1,
+        ttl=settings.YOUTUBE_CACHE_TTL_SECONDS,
+    )
+    service = YouTubeService(api_key=settings.YOUTUBE_API_KEY)
+    enricher = None if args.no_enrich else VideoEnricher(
+        service, max_age=settings.YOUTUBE_ENRICHMENT_MAX_AGE_SECONDS,
+    )
+
+    async def run():
+        try:
+            return await warm_catalog(
+                catalog, service, cache, enricher,
+                max_results=args.max_results, quota=args.quota,
+                concurrency=args.concurrency, rate=args.rate,
+            )
+        finally:
+            await service.aclose()
+
+    result = asyncio.run(run())
+    print(f"Warmed {result.warmed}, already cached {result.skipped}, failed {result.failed}, "
+          f"left for next run {result.remaining} (quota used {result.quota_used}/{args.quota})")
+
+
+if __name__ == "__main__":
+    main()
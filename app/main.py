@@ -1,15 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from .config import settings
-from .models import models, database
+from .models import models, database, migrations
 from .models.schemas import UserCreate, UserLogin, AssessmentCreate, AssessmentResponse, RecommendationRequest, RecommendationResponse
 from .services import user_service, assessment_service, recommendation_service
 from .services.youtube_service import YouTubeService
+from .services.catalog_cache import catalog_cache
+from .services.metrics import MetricsMiddleware, cache_samples, metrics, pool_samples
+from .services.profile_cache import profile_cache
+from .services.scoring_engine import scoring_engine
 
-# Create database tables
-models.Base.metadata.create_all(bind=database.engine)
+# Create missing tables and bring existing ones up to the models
+migrations.upgrade(database.engine)
 
-app = FastAPI(title=settings.PROJECT_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Finish queued enrichment, then close pooled upstream and database connections
+    if recommendations.video_enricher is not None:
+        await recommendations.video_enricher.aclose()
+    await youtube_service.aclose()
+    await database.dispose_async_engine()
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
 # CORS middleware
 if settings.BACKEND_CORS_ORIGINS:
@@ -21,14 +36,18 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
-# Initialize YouTube Service
-youtube_service = YouTubeService(api_key=settings.YOUTUBE_API_KEY)
+# Request latency by route; added last so it is outermost and times the whole stack
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware, registry=metrics)
 
 # Include routers
 from .routes import users, assessments, recommendations
-app.include_router(users.router, prefix=settings.API_V1_STR, tags=["users"])
-app.include_router(assessments.router, prefix=settings.API_V1_STR, tags=["assessments"])
-app.include_router(recommendations.router, prefix=settings.API_V1_STR, tags=["recommendations"])
+
+# Shared YouTube Service (one connection pool per process)
+youtube_service = recommendations.youtube_service
+app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
+app.include_router(assessments.router, prefix=f"{settings.API_V1_STR}/assessments", tags=["assessments"])
+app.include_router(recommendations.router, prefix=f"{settings.API_V1_STR}/recommendations", tags=["recommendations"])
 
 @app.get("/")
 async def root():
@@ -37,3 +56,33 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+def _collect_gauges():
+    search = youtube_service.cache_stats()
+    if search is not None:
+        memory = search["memory"]
+        yield from cache_samples("youtube_search", {
+            "hits": memory["hits"] + search["db_hits"],
+            "misses": search["db_misses"],
+            "hit_ratio": search["hit_ratio"],
+            "size": memory["size"],
+        })
+    if recommendations.video_enricher is not None:
+        yield from cache_samples("youtube_enrichment", recommendations.video_enricher.stats()["memory"])
+    yield from cache_samples("catalog", catalog_cache.stats())
+    yield from cache_samples("profile_scores", profile_cache.stats())
+    yield from cache_samples("profile_results", scoring_engine.results.stats())
+    yield from pool_samples("sync", database.pool_status(database.engine))
+    async_engine = database.async_engine_created()
+    if async_engine is not None:
+        yield from pool_samples("async", database.pool_status(async_engine))
+
+if metrics.enabled:
+    metrics.register_collector(_collect_gauges)
+
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def prometheus_metrics():
+        """
+        Latency histograms, cache hit ratios and pool stats in Prometheus text format.
+        """
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
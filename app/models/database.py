@@ -1,15 +1,161 @@
-from sqlalchemy import create_engine
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, Text, cast, create_engine, event, func, or_
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from ..config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+# asyncio drivers used for each backend by the async engine
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+# QueuePool-only options, dropped when another pool class is requested
+POOL_SIZING_OPTIONS = ("pool_size", "max_overflow", "pool_timeout")
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def async_database_url(database_url: str):
+    """``database_url`` with its driver swapped for the asyncio one (aiosqlite, asyncpg)."""
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(
+            f"No async driver configured for {url.get_backend_name()!r}; "
+            f"routes on async sessions need one of {sorted(ASYNC_DRIVERS)}"
+        )
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}")
+
+
+def engine_options(database_url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    ``create_engine`` keyword arguments for ``database_url`` from settings.
+
+    File-backed SQLite and PostgreSQL get a sized QueuePool with pre-ping and
+    recycling; in-memory SQLite shares one connection (StaticPool), since
+    every new connection would otherwise see an empty database.
+    """
+    url = make_url(database_url)
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    if url.get_backend_name() == "sqlite":
+        # Sessions may be used from a different thread than the one that opened the connection
+        options["connect_args"] = {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+        if _is_memory_sqlite(url):
+            options["poolclass"] = StaticPool
+            return options
+    elif url.get_backend_name() == "postgresql" and is_async:
+        # asyncpg spells the same options differently from psycopg2
+        options["connect_args"] = {
+            "timeout": settings.DB_CONNECT_TIMEOUT_SECONDS,
+            "server_settings": {"application_name": settings.PROJECT_NAME},
+        }
+    elif url.get_backend_name() == "postgresql":
+        options["connect_args"] = {
+            "connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS,
+            "application_name": settings.PROJECT_NAME,
+        }
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # Durable at checkpoints; the WAL makes NORMAL safe against corruption
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(database_url: Optional[str] = None, **overrides) -> Engine:
+    """Build an engine from settings; ``overrides`` win over the computed options."""
+    database_url = database_url or SQLALCHEMY_DATABASE_URL
+    url = make_url(database_url)
+    options = engine_options(database_url)
+    if "poolclass" in overrides:
+        for key in POOL_SIZING_OPTIONS:
+            options.pop(key, None)
+    engine = create_engine(url, **{**options, **overrides})
+    if url.get_backend_name() == "sqlite" and not _is_memory_sqlite(url):
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+def create_async_db_engine(database_url: Optional[str] = None, **overrides) -> AsyncEngine:
+    """Async counterpart of ``create_db_engine`` for the same database."""
+    database_url = database_url or SQLALCHEMY_DATABASE_URL
+    url = make_url(database_url)
+    options = engine_options(database_url, is_async=True)
+    if "poolclass" in overrides:
+        for key in POOL_SIZING_OPTIONS:
+            options.pop(key, None)
+    engine = create_async_engine(async_database_url(database_url), **{**options, **overrides})
+    if url.get_backend_name() == "sqlite" and not _is_memory_sqlite(url):
+        event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return engine
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Connection counts of ``engine``'s pool (zeros for pools that do not track them)."""
+    pool = engine.sync_engine.pool if isinstance(engine, AsyncEngine) else engine.pool
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size() if hasattr(pool, "size") else 0,
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else 0,
+    }
+
+
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Used by async routes so queries do not block the event loop; same database as ``engine``.
+# Created on first use: backends without an async driver still serve every sync route.
+_async_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[async_sessionmaker] = None
+_async_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """The shared async engine; raises ``ValueError`` if the backend has no async driver."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        with _async_lock:
+            if _async_engine is None:
+                async_engine = create_async_db_engine(SQLALCHEMY_DATABASE_URL)
+                _async_sessionmaker = async_sessionmaker(
+                    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False,
+                )
+                _async_engine = async_engine
+    return _async_engine
+
+
+def async_engine_created() -> Optional[AsyncEngine]:
+    """The async engine if anything has used it yet, else None."""
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
 Base = declarative_base()
 
 def get_db():
@@ -18,3 +164,54 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    get_async_engine()
+    async with _async_sessionmaker() as db:
+        yield db
+
+def _comparable(column):
+    # JSON has no equality operator on PostgreSQL; compare its text form
+    return cast(column, Text) if isinstance(column.type, JSON) else column
+
+
+def bulk_upsert(db, model, rows, key_columns, update_columns=None, skip_unchanged=False):
+    """
+    Insert ``rows`` (a list of column dicts) in one executemany, updating
+    rows whose ``key_columns`` already exist. Uses ON CONFLICT on SQLite and
+    PostgreSQL and falls back to per-row merge elsewhere. With
+    ``skip_unchanged``, existing rows whose ``update_columns`` already match
+    are left alone, so ``updated_at`` only moves on real changes.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for row in rows:
+            db.merge(model(**row))
+        return
+
+    if update_columns is None:
+        update_columns = [column for column in rows[0] if column not in key_columns]
+    # Core insert on the table: skips the ORM bulk-insert bookkeeping per row
+    stmt = insert(model.__table__)
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    # onupdate defaults do not fire for ON CONFLICT updates
+    if "updated_at" in model.__table__.c and "updated_at" not in set_:
+        set_["updated_at"] = func.now()
+    if set_ and skip_unchanged and update_columns:
+        table = model.__table__
+        changed = or_(*[
+            _comparable(table.c[column]).is_distinct_from(_comparable(stmt.excluded[column]))
+            for column in update_columns
+        ])
+        stmt = stmt.on_conflict_do_update(index_elements=key_columns, set_=set_, where=changed)
+    elif set_:
+        stmt = stmt.on_conflict_do_update(index_elements=key_columns, set_=set_)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=key_columns)
+    db.execute(stmt, rows)
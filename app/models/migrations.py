@@ -0,0 +1,57 @@
+"""
+Schema upgrades for databases created by an earlier release.
+
+``create_all`` only creates missing tables; it never alters an existing
+one. ``upgrade`` runs it, then adds each column in ``ADDED_COLUMNS`` that
+the table lacks and creates every model index that does not exist yet
+(once its columns do). Every step checks the live schema first, so it is
+safe to run on each start and on a database that is already current.
+"""
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+# Importing the models registers their tables on Base.metadata
+from .models import Base
+
+# (table, column, backfill) for columns added to existing tables, oldest first.
+# NOT NULL columns need a backfill: the SQL default existing rows are given.
+ADDED_COLUMNS: List[Tuple[str, str, Optional[str]]] = [
+    ("assessments", "tags", None),
+    ("recommendations", "source", "'content'"),
+    ("youtube_videos", "enriched_at", None),
+    ("assessments", "catalog_id", None),
+]
+
+
+def _add_column_ddl(engine: Engine, table_name: str, column_name: str, backfill: Optional[str]) -> str:
+    column = Base.metadata.tables[table_name].c[column_name]
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column.type.compile(engine.dialect)}"
+    if backfill is not None:
+        ddl += f" NOT NULL DEFAULT {backfill}"
+    return ddl
+
+
+def _column_names(conn, table_name: str) -> Set[str]:
+    # A fresh inspector each time: inspectors cache what they have read
+    return {column["name"] for column in inspect(conn).get_columns(table_name)}
+
+
+def upgrade(engine: Engine) -> List[str]:
+    """Bring the database behind ``engine`` up to the models; returns the columns it added."""
+    Base.metadata.create_all(bind=engine)
+    added = []
+    with engine.begin() as conn:
+        for table_name, column_name, backfill in ADDED_COLUMNS:
+            if column_name in _column_names(conn, table_name):
+                continue
+            conn.execute(text(_add_column_ddl(engine, table_name, column_name, backfill)))
+            added.append(f"{table_name}.{column_name}")
+        for table in Base.metadata.sorted_tables:
+            columns = _column_names(conn, table.name)
+            for index in table.indexes:
+                # An index on a column that no step adds yet waits for that step
+                if {column.name for column in index.columns} <= columns:
+                    index.create(conn, checkfirst=True)
+    return added
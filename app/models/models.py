@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, DateTime, Text, JSON
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, DateTime, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -15,6 +15,11 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Keyset list pages filtered on is_active walk it in id order
+    __table_args__ = (
+        Index("ix_users_active_id", "is_active", "id"),
+    )
+
     # Relationships
     assessments = relationship("Assessment", back_populates="owner")
 
@@ -22,6 +27,7 @@ class Assessment(Base):
     __tablename__ = "assessments"
 
     id = Column(Integer, primary_key=True, index=True)
+    catalog_id = Column(String, unique=True, index=True, nullable=True)  # data/catalog.json "id" of ingested items
     title = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
     category = Column(String, index=True, nullable=False)
@@ -29,14 +35,22 @@ class Assessment(Base):
     duration_minutes = Column(Integer, nullable=False)
     questions = Column(JSON, nullable=False)  # Store questions as JSON
     passing_score = Column(Float, nullable=False)  # Passing percentage
+    tags = Column(JSON, nullable=True)  # List of tags as JSON
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     owner_id = Column(Integer, ForeignKey("users.id"))
 
+    # Catalog filters narrow by category, then difficulty, over active rows;
+    # keyset list pages walk (category, is_active) in id order
+    __table_args__ = (
+        Index("ix_assessments_category_difficulty_active", "category", "difficulty", "is_active"),
+        Index("ix_assessments_category_active_id", "category", "is_active", "id"),
+    )
+
     # Relationships
     owner = relationship("User", back_populates="assessments")
-    recommendations = relationship("Recommendation", back_populates="assessment")
+    recommendations = relationship("Recommendation", foreign_keys="Recommendation.assessment_id", back_populates="assessment")
 
 class UserAssessment(Base):
     __tablename__ = "user_assessments"
@@ -57,8 +71,14 @@ class Recommendation(Base):
     recommended_assessment_id = Column(Integer, ForeignKey("assessments.id"), nullable=False)
     score = Column(Float, nullable=False)  # Similarity score (0-1)
     reason = Column(Text, nullable=True)  # Why this recommendation was made
+    source = Column(String, nullable=False, default="content")  # Job that produced it, e.g. "content"
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Neighbor lookups read one (assessment, source) slice, best score first
+    __table_args__ = (
+        Index("ix_recommendations_assessment_source_score", "assessment_id", "source", "score"),
+    )
+
     # Relationships
     assessment = relationship("Assessment", foreign_keys=[assessment_id], back_populates="recommendations")
     recommended_assessment = relationship("Assessment", foreign_keys=[recommended_assessment_id])
@@ -78,5 +98,15 @@ class YouTubeVideo(Base):
     like_count = Column(Integer, nullable=True)
     category = Column(String, nullable=True)  # e.g., "Tutorial", "Lecture", "Interview"
     tags = Column(JSON, nullable=True)  # List of tags as JSON
+    enriched_at = Column(DateTime(timezone=True), nullable=True)  # Last videos.list refresh
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class YouTubeQuery(Base):
+    __tablename__ = "youtube_queries"
+
+    query_key = Column(String, primary_key=True)  # "<max_results>:<normalized query>"
+    query = Column(String, nullable=False)
+    max_results = Column(Integer, nullable=False)
+    video_ids = Column(JSON, nullable=False)  # Ordered list of YouTube video IDs
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
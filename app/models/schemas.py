@@ -31,6 +31,20 @@ class UserInDB(UserBase):
     class Config:
         from_attributes = True
 
+# Keyset-paginated user list; items hold only the requested fields (routes exclude unset ones)
+class UserListItem(BaseModel):
+    id: int
+    email: Optional[str] = None
+    full_name: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_superuser: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class UserPage(BaseModel):
+    items: List[UserListItem]
+    next_cursor: Optional[str] = None
+
 # Token schemas
 class Token(BaseModel):
     access_token: str
@@ -69,7 +83,7 @@ class AssessmentCreate(AssessmentBase):
 
 class AssessmentResponse(AssessmentBase):
     id: int
-    owner_id: int
+    owner_id: Optional[int] = None
     is_active: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -78,6 +92,27 @@ class AssessmentResponse(AssessmentBase):
     class Config:
         from_attributes = True
 
+# Keyset-paginated assessment list; items hold only the requested fields
+class AssessmentListItem(BaseModel):
+    id: int
+    catalog_id: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    difficulty: Optional[str] = None
+    duration_minutes: Optional[int] = None
+    questions: Optional[List[Dict[str, Any]]] = None
+    passing_score: Optional[float] = None
+    tags: Optional[List[str]] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    owner_id: Optional[int] = None
+
+class AssessmentPage(BaseModel):
+    items: List[AssessmentListItem]
+    next_cursor: Optional[str] = None
+
 class AssessmentUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -106,9 +141,14 @@ class UserAssessmentResponse(UserAssessmentBase):
         from_attributes = True
 
 # Recommendation schemas
+class RecommendationSource(str, Enum):
+    CONTENT = "content"
+    COLLABORATIVE = "collaborative"
+
 class RecommendationRequest(BaseModel):
     user_id: int
-    assessment_id: int
+    assessment_id: Optional[int] = None  # defaults to the user's latest completed assessment
+    source: Optional[RecommendationSource] = None  # defaults to the service's source
     limit: int = Field(5, ge=1, le=10)
 
 class RecommendationItem(BaseModel):
@@ -120,6 +160,27 @@ class RecommendationItem(BaseModel):
 class RecommendationResponse(BaseModel):
     recommendations: List[RecommendationItem]
 
+class BatchRecommendationRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=5000)
+    limit: int = Field(5, ge=1, le=50)
+
+class ScoredAssessment(BaseModel):
+    assessment_id: int
+    score: float
+
+class UserRecommendations(BaseModel):
+    user_id: int
+    recommendations: List[ScoredAssessment]
+
+class BatchRecommendationResponse(BaseModel):
+    results: List[UserRecommendations]
+
+class ProfileRecommendationRequest(BaseModel):
+    category: Optional[str] = None  # questionnaire expertise (q1)
+    skills: List[str] = Field(default_factory=list, max_length=50)  # q2
+    position_level: Optional[str] = None  # q5
+    k: int = Field(3, ge=1, le=50)
+
 # YouTube schemas
 class YouTubeVideoBase(BaseModel):
     video_id: str
@@ -1,7 +1,36 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.database import get_async_db
+from ..models.schemas import AssessmentPage, AssessmentResponse
+from ..services.assessment_service import assessment_service
+from ..services.pagination import MAX_PAGE_SIZE, decode_cursor
 
 router = APIRouter()
 
-@router.get("/")
-async def get_assessments():
-    return []
+@router.get("/", response_model=AssessmentPage, response_model_exclude_unset=True)
+async def get_assessments(
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    is_active: Optional[bool] = True,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,questions"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List assessments in id order; pass ``next_cursor`` back as ``cursor`` for the next page.
+    """
+    try:
+        items, next_cursor = await assessment_service.list_assessments(
+            db, limit=limit, after_id=decode_cursor(cursor), category=category, is_active=is_active, fields=fields,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/{assessment_id}", response_model=AssessmentResponse)
+async def get_assessment(assessment_id: int, db: AsyncSession = Depends(get_async_db)):
+    assessment = await assessment_service.get_assessment(db, assessment_id)
+    if assessment is None:
+        raise HTTPException(status_code=404, detail="Assessment not found")
+    return assessment
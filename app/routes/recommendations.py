@@ -1,13 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
+from sqlalchemy.orm import Session
 from ..services.youtube_service import YouTubeService
-from ..models.schemas import YouTubeSearchRequest, YouTubeSearchResponse, YouTubeVideoResponse
+from ..services.youtube_cache import YouTubeSearchCache, catalog_query
+from ..services.catalog_cache import catalog_cache
+from ..services.youtube_enrichment import VideoEnricher
+from ..services.recommendation_service import recommendation_service
+from ..services.profile_cache import profile_cache
+from ..models.database import get_db
+from ..models.schemas import (
+    YouTubeSearchRequest, YouTubeSearchResponse, YouTubeVideoResponse,
+    RecommendationRequest, RecommendationResponse,
+    BatchRecommendationRequest, BatchRecommendationResponse, ProfileRecommendationRequest,
+)
 from ..config import settings
 
 router = APIRouter()
 
 # Initialize service (in a real app, use dependency injection)
-youtube_service = YouTubeService(api_key=settings.YOUTUBE_API_KEY)
+youtube_cache = YouTubeSearchCache(
+    maxsize=settings.YOUTUBE_CACHE_MAX_ENTRIES,
+    ttl=settings.YOUTUBE_CACHE_TTL_SECONDS,
+    persist=settings.YOUTUBE_CACHE_PERSIST,
+) if settings.YOUTUBE_CACHE_ENABLED else None
+youtube_service = YouTubeService(api_key=settings.YOUTUBE_API_KEY, cache=youtube_cache)
+video_enricher = VideoEnricher(
+    youtube_service,
+    max_age=settings.YOUTUBE_ENRICHMENT_MAX_AGE_SECONDS,
+    batch_window=settings.YOUTUBE_ENRICHMENT_BATCH_WINDOW_SECONDS,
+) if settings.YOUTUBE_ENRICHMENT_ENABLED else None
 
 @router.post("/search", response_model=YouTubeSearchResponse)
 async def search_videos(request: YouTubeSearchRequest):
@@ -15,11 +36,82 @@ async def search_videos(request: YouTubeSearchRequest):
     Search for videos based on a query.
     """
     try:
-        results = youtube_service.search_videos(request.query, request.max_results)
+        results = await youtube_service.search_videos(request.query, request.max_results)
+        if video_enricher is not None:
+            results = await video_enricher.enrich(results)
         return {"videos": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/search/cache")
+async def search_cache_stats():
+    """
+    Hit ratio and eviction counters for the YouTube search and enrichment caches.
+    """
+    return {
+        "enabled": youtube_service.cache is not None,
+        "stats": youtube_service.cache_stats(),
+        "enrichment": video_enricher.stats() if video_enricher is not None else None,
+    }
+
+@router.get("/catalog")
+def search_catalog(q: str = Query(..., min_length=1), k: int = Query(5, ge=1, le=50)):
+    """
+    Free-text search over catalog titles, descriptions and tags.
+    """
+    return {"results": recommendation_service.search_catalog(q, k)}
+
+@router.post("/profile")
+def recommend_profile(request: ProfileRecommendationRequest):
+    """
+    Best catalog matches for questionnaire answers; repeat profiles are served from memory.
+    """
+    return {"results": recommendation_service.recommend_profile(
+        request.category, request.skills, request.position_level, request.k,
+    )}
+
+@router.get("/profile/cache")
+def profile_cache_stats():
+    """
+    Hit ratio and size of the questionnaire profile cache.
+    """
+    return profile_cache.stats()
+
+@router.get("/catalog/{item_id}/videos", response_model=YouTubeSearchResponse)
+async def catalog_videos(item_id: str, max_results: int = Query(5, ge=1, le=25)):
+    """
+    Video previews for a catalog entry; a local read once the warm-up job has run.
+    """
+    item = catalog_cache.get_item(settings.CATALOG_PATH, item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Catalog item not found")
+    results = await youtube_service.search_videos(catalog_query(item), max_results)
+    if video_enricher is not None:
+        results = await video_enricher.enrich(results)
+    return {"videos": results}
+
 @router.get("/", tags=["recommendations"])
 async def get_recommendations():
     return {"message": "Recommendations endpoint"}
+
+@router.post("/", response_model=RecommendationResponse)
+def recommend(request: RecommendationRequest, db: Session = Depends(get_db)):
+    """
+    Return precomputed neighbors of an assessment (or of the user's latest one).
+    """
+    return recommendation_service.recommend(db, request)
+
+@router.post("/batch", response_model=BatchRecommendationResponse)
+def recommend_batch(request: BatchRecommendationRequest, db: Session = Depends(get_db)):
+    """
+    Hybrid (content + collaborative + popularity) recommendations for up to 5000 users in one call.
+    """
+    scored = recommendation_service.score_batch(db, request.user_ids, request.limit)
+    return {
+        "results": [
+            {"user_id": user_id, "recommendations": [
+                {"assessment_id": assessment_id, "score": score} for assessment_id, score in items
+            ]}
+            for user_id, items in scored.items()
+        ]
+    }
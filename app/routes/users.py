@@ -1,7 +1,35 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.database import get_async_db
+from ..models.schemas import UserInDB, UserPage
+from ..services.pagination import MAX_PAGE_SIZE, decode_cursor
+from ..services.user_service import user_service
 
 router = APIRouter()
 
-@router.get("/")
-async def get_users():
-    return []
+@router.get("/", response_model=UserPage, response_model_exclude_unset=True)
+async def get_users(
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List users in id order; pass ``next_cursor`` back as ``cursor`` for the next page.
+    """
+    try:
+        items, next_cursor = await user_service.list_users(
+            db, limit=limit, after_id=decode_cursor(cursor), is_active=is_active, fields=fields,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/{user_id}", response_model=UserInDB)
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    user = await user_service.get_user(db, user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
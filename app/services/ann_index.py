@@ -0,0 +1,133 @@
+"""
+Nearest-neighbor search over dense, L2-normalized item vectors.
+
+Two interchangeable backends share ``search(query, k)``:
+
+- ``BruteForceIndex`` scores every item, so it is exact; it is the
+  reference for correctness checks and the right choice for small catalogs.
+- ``IVFIndex`` clusters items with spherical k-means and only scores the
+  ``n_probe`` clusters closest to the query, trading a little recall for
+  latency that grows with ``n / n_lists`` rather than ``n``.
+
+``build_ann_index`` picks the backend from ``Settings.ANN_BACKEND``.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+
+def top_k(scores: np.ndarray, positions: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Best ``k`` entries of ``scores`` as (positions, scores), ties going to the lower position."""
+    if k < len(scores):
+        # Keep every entry tied with the k-th score so the tie-break sees all of them
+        kth = np.partition(-scores, k - 1)[k - 1]
+        top = np.flatnonzero(-scores <= kth)
+    else:
+        top = np.arange(len(scores))
+    top = top[np.lexsort((positions[top], -scores[top]))][:k]
+    return positions[top], scores[top]
+
+
+class BruteForceIndex:
+    """Exact inner-product search over every vector."""
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._positions = np.arange(len(self.vectors))
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(self.vectors) or k <= 0:
+            return self._positions[:0], np.zeros(0, dtype=np.float32)
+        scores = self.vectors @ np.asarray(query, dtype=np.float32)
+        return top_k(scores, self._positions, k)
+
+
+class IVFIndex:
+    """
+    Inverted-file index: vectors are grouped by nearest centroid and stored
+    contiguously per list, so a query scores only the probed lists.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        n_lists: int = 0,
+        n_probe: int = 8,
+        n_iter: int = 10,
+        sample_per_list: int = 64,
+        seed: int = 0,
+    ):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n = len(vectors)
+        self.n_lists = max(1, min(n_lists or int(np.sqrt(n)), n)) if n else 1
+        self.n_probe = n_probe
+        rng = np.random.default_rng(seed)
+
+        if n:
+            # Spherical k-means on a sample; unit-norm centroids make assignment an argmax of dot products
+            sample_size = min(n, self.n_lists * sample_per_list)
+            sample = vectors[rng.choice(n, sample_size, replace=False)]
+            centroids = sample[rng.choice(sample_size, self.n_lists, replace=False)].copy()
+            for _ in range(n_iter):
+                assign = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assign, sample)
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                filled = norms[:, 0] > 0  # empty clusters keep their previous centroid
+                centroids[filled] = sums[filled] / norms[filled]
+            assign = self._assign(vectors, centroids)
+        else:
+            centroids = np.zeros((1, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+            assign = np.zeros(0, dtype=np.int64)
+
+        order = np.argsort(assign, kind="stable")
+        self.centroids = centroids
+        self.vectors = vectors[order]
+        self.positions = order
+        self.offsets = np.searchsorted(assign[order], np.arange(self.n_lists + 1))
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray, block: int = 65536) -> np.ndarray:
+        return np.concatenate([
+            np.argmax(vectors[start:start + block] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), block)
+        ])
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def search(self, query: np.ndarray, k: int, n_probe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        query = np.asarray(query, dtype=np.float32)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        if not len(self.vectors) or k <= 0:
+            return self.positions[:0], np.zeros(0, dtype=np.float32)
+
+        centroid_scores = self.centroids @ query
+        if n_probe < self.n_lists:
+            lists = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        else:
+            lists = np.arange(self.n_lists)
+        candidates = np.concatenate([np.arange(self.offsets[l], self.offsets[l + 1]) for l in lists])
+        scores = self.vectors[candidates] @ query
+        return top_k(scores, self.positions[candidates], k)
+
+
+BACKENDS = {
+    "brute": BruteForceIndex,
+    "ivf": IVFIndex,
+}
+
+
+def build_ann_index(vectors: np.ndarray, backend: Optional[str] = None):
+    """Build the configured backend over ``vectors``."""
+    backend = backend or settings.ANN_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown ANN backend {backend!r}; expected one of {sorted(BACKENDS)}")
+    if backend == "ivf":
+        return IVFIndex(vectors, n_lists=settings.ANN_N_LISTS, n_probe=settings.ANN_N_PROBE)
+    return BruteForceIndex(vectors)
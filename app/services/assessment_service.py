@@ -1,5 +1,48 @@
-# Stub assessment service
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import models
+from .pagination import page, projection
+
+ASSESSMENT_FIELDS = tuple(column.name for column in models.Assessment.__table__.columns)
+# Heavy columns (questions, description, tags) are only read when asked for
+ASSESSMENT_LIST_FIELDS = (
+    "id", "catalog_id", "title", "category", "difficulty", "duration_minutes", "passing_score", "is_active",
+)
+
+
 class AssessmentService:
-    pass
+    """Assessment reads for the async routes; queries are awaited on an ``AsyncSession``."""
+
+    async def get_assessment(self, db: AsyncSession, assessment_id: int) -> Optional[models.Assessment]:
+        return await db.get(models.Assessment, assessment_id)
+
+    async def list_assessments(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        category: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        fields: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One keyset page of assessments ordered by id, as plain dicts of the
+        requested ``fields``, plus the cursor of the next page (or None).
+        The (category, is_active, id) index serves filtered pages directly.
+        """
+        table = models.Assessment.__table__
+        query = select(*projection(table, fields, ASSESSMENT_FIELDS, ASSESSMENT_LIST_FIELDS))
+        if after_id is not None:
+            query = query.where(table.c.id > after_id)
+        if category is not None:
+            query = query.where(table.c.category == category)
+        if is_active is not None:
+            query = query.where(table.c.is_active.is_(is_active))
+        result = await db.execute(query.order_by(table.c.id).limit(limit + 1))
+        return page(result.mappings().all(), limit)
+
 
 assessment_service = AssessmentService()
@@ -0,0 +1,241 @@
+"""
+Compact columnar binary form of ``data/catalog.json``.
+
+The JSON file stays the source of truth. ``compile_catalog`` writes a
+sidecar file holding every string once in a UTF-8 heap, one column of
+interned string ids per field and a CSR-style tag list, and
+``load_catalog`` maps it with ``mmap`` so processes on the same host share
+the pages instead of each parsing its own copy. The sidecar records the
+size and mtime of the JSON it was built from and is rebuilt whenever those
+no longer match.
+
+Layout (little-endian)::
+
+    header          MAGIC, version, item/string/tag-ref counts, source size and mtime_ns
+    string offsets  u64[n_strings + 1] into the heap
+    field columns   u32[len(FIELDS) * n_items], MISSING when the item has no such key
+    tag offsets     u32[n_items + 1] into tag ids
+    tag ids         u32[n_tag_refs]
+    heap            UTF-8 string bytes
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+MAGIC = b"CATB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIQQ4x")
+MISSING = 0xFFFFFFFF
+
+# Scalar fields stored as columns, in the order they appear in catalog.json
+FIELDS = (
+    "id", "title", "category", "difficulty", "position_level", "provider",
+    "description", "remote_support", "adaptive_reasoning",
+)
+TAGS_FIELD = "tags"
+
+
+def default_binary_path(json_path: str) -> str:
+    return os.path.splitext(json_path)[0] + ".bin"
+
+
+def compile_catalog(json_path: str, binary_path: Optional[str] = None) -> str:
+    """
+    Compile ``json_path`` into the binary format and return the output path.
+
+    Raises ValueError for items the format cannot represent exactly (unknown
+    keys, non-string values or a missing tag list), so callers can fall back
+    to the JSON.
+    """
+    binary_path = binary_path or default_binary_path(json_path)
+    stat = os.stat(json_path)
+    with open(json_path, "r") as f:
+        catalog = json.load(f)
+
+    string_ids: Dict[str, int] = {}
+    strings: List[bytes] = []
+
+    def intern(value: Any) -> int:
+        if not isinstance(value, str):
+            raise ValueError(f"Unsupported catalog value {value!r}")
+        sid = string_ids.get(value)
+        if sid is None:
+            sid = string_ids[value] = len(strings)
+            strings.append(value.encode("utf-8"))
+        return sid
+
+    n_items = len(catalog)
+    columns = np.full((len(FIELDS), n_items), MISSING, dtype="<u4")
+    tag_offsets = np.zeros(n_items + 1, dtype="<u4")
+    tag_ids: List[int] = []
+    field_order = FIELDS + (TAGS_FIELD,)
+
+    for pos, item in enumerate(catalog):
+        if not isinstance(item, dict) or not set(item) <= set(field_order):
+            raise ValueError(f"Unsupported catalog item {item!r}")
+        for col, field in enumerate(FIELDS):
+            if field in item:
+                columns[col, pos] = intern(item[field])
+        tags = item.get(TAGS_FIELD)
+        if not isinstance(tags, list):
+            raise ValueError(f"Unsupported tags value {tags!r}")
+        tag_ids.extend(intern(tag) for tag in tags)
+        tag_offsets[pos + 1] = len(tag_ids)
+
+    string_offsets = np.zeros(len(strings) + 1, dtype="<u8")
+    np.cumsum([len(s) for s in strings], out=string_offsets[1:])
+
+    header = HEADER.pack(
+        MAGIC, VERSION, 0, n_items, len(strings), len(tag_ids), stat.st_size, stat.st_mtime_ns,
+    )
+
+    # Write beside the target and swap it in, so readers never see a partial file
+    tmp_path = f"{binary_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(string_offsets.tobytes())
+        f.write(columns.tobytes())
+        f.write(tag_offsets.tobytes())
+        f.write(np.asarray(tag_ids, dtype="<u4").tobytes())
+        f.write(b"".join(strings))
+    os.replace(tmp_path, binary_path)
+    return binary_path
+
+
+def is_stale(json_path: str, binary_path: str) -> bool:
+    """True when the binary file is missing, unreadable or built from a different JSON."""
+    try:
+        stat = os.stat(json_path)
+        with open(binary_path, "rb") as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return True
+    if len(header) < HEADER.size:
+        return True
+    magic, version, _, _, _, _, size, mtime_ns = HEADER.unpack(header)
+    return (magic, version, size, mtime_ns) != (MAGIC, VERSION, stat.st_size, stat.st_mtime_ns)
+
+
+class BinaryCatalog(Sequence):
+    """
+    Read-only, memory-mapped view of a compiled catalog.
+
+    Behaves like the list of dicts from ``json.load``: indexing returns a
+    fresh dict for that item, decoded on demand. ``column`` and
+    ``tag_lists`` decode whole fields at once, turning each interned string
+    into a Python object only once.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, n_items, n_strings, n_tag_refs, _, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} compiled catalog")
+
+        offset = HEADER.size
+        self._string_offsets = np.frombuffer(self._mmap, dtype="<u8", count=n_strings + 1, offset=offset)
+        offset += self._string_offsets.nbytes
+        self._columns = np.frombuffer(
+            self._mmap, dtype="<u4", count=len(FIELDS) * n_items, offset=offset,
+        ).reshape(len(FIELDS), n_items)
+        offset += self._columns.nbytes
+        self._tag_offsets = np.frombuffer(self._mmap, dtype="<u4", count=n_items + 1, offset=offset)
+        offset += self._tag_offsets.nbytes
+        self._tag_ids = np.frombuffer(self._mmap, dtype="<u4", count=n_tag_refs, offset=offset)
+        self._heap_start = offset + self._tag_ids.nbytes
+        self._n_items = n_items
+
+    def __len__(self) -> int:
+        return self._n_items
+
+    def __getitem__(self, pos: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(self._n_items))]
+        if pos < 0:
+            pos += self._n_items
+        if not 0 <= pos < self._n_items:
+            raise IndexError("catalog index out of range")
+
+        item: Dict[str, Any] = {}
+        for col, field in enumerate(FIELDS):
+            sid = int(self._columns[col, pos])
+            if sid != MISSING:
+                item[field] = self.string(sid)
+        start, end = self._tag_offsets[pos], self._tag_offsets[pos + 1]
+        item[TAGS_FIELD] = [self.string(int(sid)) for sid in self._tag_ids[start:end]]
+        return item
+
+    def string(self, sid: int) -> str:
+        start = self._heap_start + int(self._string_offsets[sid])
+        end = self._heap_start + int(self._string_offsets[sid + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def column(self, field: str) -> List[Optional[str]]:
+        """Decode one scalar field for every item, ``None`` where it is missing."""
+        ids = self._columns[FIELDS.index(field)]
+        decoded: Dict[int, Optional[str]] = {MISSING: None}
+        values = []
+        for sid in ids.tolist():
+            if sid not in decoded:
+                decoded[sid] = self.string(sid)
+            values.append(decoded[sid])
+        return values
+
+    def tag_lists(self) -> List[List[str]]:
+        """Decode the tag list of every item."""
+        decoded: Dict[int, str] = {}
+        tag_ids = self._tag_ids.tolist()
+        offsets = self._tag_offsets.tolist()
+        tag_lists = []
+        for pos in range(self._n_items):
+            tags = []
+            for sid in tag_ids[offsets[pos]:offsets[pos + 1]]:
+                tag = decoded.get(sid)
+                if tag is None:
+                    tag = decoded[sid] = self.string(sid)
+                tags.append(tag)
+            tag_lists.append(tags)
+        return tag_lists
+
+
+def load_catalog(json_path: str, binary_path: Optional[str] = None) -> Union[BinaryCatalog, List[Dict[str, Any]]]:
+    """
+    Load the catalog through its compiled form, rebuilding it first if stale.
+
+    Falls back to the parsed JSON when the binary file cannot be written or
+    the catalog does not fit the format. Raises FileNotFoundError when the
+    JSON itself is missing.
+    """
+    binary_path = binary_path or default_binary_path(json_path)
+    if is_stale(json_path, binary_path):
+        if not os.path.exists(json_path):
+            raise FileNotFoundError(json_path)
+        try:
+            compile_catalog(json_path, binary_path)
+        except (OSError, ValueError):
+            with open(json_path, "r") as f:
+                return json.load(f)
+    return BinaryCatalog(binary_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile catalog.json into the memory-mapped binary format")
+    parser.add_argument("json_path", nargs="?", default=os.path.join("data", "catalog.json"))
+    parser.add_argument("--output", default=None, help="Binary file to write (default: next to the JSON)")
+    args = parser.parse_args(argv)
+
+    output = compile_catalog(args.json_path, args.output)
+    print(f"Compiled {args.json_path} -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import os
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from .catalog_binary import load_catalog
+from .catalog_index import CatalogIndex, catalog_column
+from .metrics import metrics
+
+
+class CatalogEntry(NamedTuple):
+    key: Tuple[str, int, int]
+    catalog: Sequence
+    index: CatalogIndex
+    positions: Dict[Any, int]  # item id -> catalog position
+
+
+def id_positions(catalog: Sequence) -> Dict[Any, int]:
+    """Catalog position of each item id; the first item wins if an id repeats."""
+    positions: Dict[Any, int] = {}
+    for pos, item_id in enumerate(catalog_column(catalog, "id")):
+        if item_id is not None:
+            positions.setdefault(item_id, pos)
+    return positions
+
+
+class CatalogCache:
+    """
+    Process-wide catalog cache shared by the Streamlit app and the API.
+
+    Entries are keyed on (path, mtime_ns, size), so a lookup costs one
+    ``stat`` and the catalog is only re-read when the file changes. A reload
+    builds the new catalog and index off to the side and swaps the entry in
+    one assignment, so concurrent readers see either the old or the new
+    catalog, never a half-built one.
+    """
+
+    def __init__(self, loader: Callable[[str], Sequence] = load_catalog):
+        self._loader = loader
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @staticmethod
+    def _file_key(path: str) -> Tuple[str, int, int]:
+        stat = os.stat(path)
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    def get(self, path: str) -> CatalogEntry:
+        """Return the cached entry for ``path``, loading it if missing or stale."""
+        path = os.path.abspath(path)
+        key = self._file_key(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            entry = self._entries.get(path)
+            key = self._file_key(path)
+            if entry is not None and entry.key == key:
+                self.hits += 1
+                return entry
+
+            with metrics.timer("app_stage_duration_seconds", stage="catalog_load"):
+                catalog = self._loader(path)
+                new_entry = CatalogEntry(key, catalog, CatalogIndex(catalog), id_positions(catalog))
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+            self._entries[path] = new_entry
+            return new_entry
+
+    def get_catalog(self, path: str) -> Sequence:
+        return self.get(path).catalog
+
+    def get_index(self, path: str) -> CatalogIndex:
+        return self.get(path).index
+
+    def get_item(self, path: str, item_id: Any) -> Optional[Dict[str, Any]]:
+        """The catalog item with ``item_id``, or None; a dictionary lookup, not a scan."""
+        entry = self.get(path)
+        pos = entry.positions.get(item_id)
+        return None if pos is None else entry.catalog[pos]
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.reloads
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+catalog_cache = CatalogCache()
@@ -0,0 +1,102 @@
+import heapq
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Scoring weights shared by the batch predictor and the Streamlit UI
+CATEGORY_WEIGHT = 50
+POSITION_LEVEL_WEIGHT = 25
+TAG_WEIGHT = 15
+
+
+def catalog_column(catalog: Sequence, field: str) -> List[Optional[Any]]:
+    """Return ``field`` for every item, reading a compiled catalog's column directly."""
+    if hasattr(catalog, "column"):
+        return catalog.column(field)
+    return [item.get(field) for item in catalog]
+
+
+def catalog_tag_lists(catalog: Sequence) -> List[List[str]]:
+    """Return the tag list of every item, reading a compiled catalog's tags directly."""
+    if hasattr(catalog, "tag_lists"):
+        return catalog.tag_lists()
+    return [item.get("tags", []) for item in catalog]
+
+
+class CatalogIndex:
+    """
+    Inverted index over the catalog.
+
+    Posting lists map each category, position level and tag to the catalog
+    positions that carry it, so scoring a profile only touches the items it
+    can actually match instead of scanning the whole catalog.
+    """
+
+    def __init__(self, catalog: Sequence):
+        # Items are only materialized for the winners, so a compiled catalog stays lazy
+        self.items = catalog if isinstance(catalog, Sequence) else list(catalog)
+        by_category = defaultdict(list)
+        by_position_level = defaultdict(list)
+        by_tag = defaultdict(list)
+
+        for pos, category in enumerate(catalog_column(self.items, "category")):
+            if category is not None:
+                by_category[category].append(pos)
+        for pos, position_level in enumerate(catalog_column(self.items, "position_level")):
+            if position_level is not None:
+                by_position_level[position_level].append(pos)
+        for pos, tags in enumerate(catalog_tag_lists(self.items)):
+            # A tag listed twice on one item still only matches once
+            for tag in dict.fromkeys(tags):
+                by_tag[tag].append(pos)
+
+        self.by_category: Dict[str, List[int]] = dict(by_category)
+        self.by_position_level: Dict[str, List[int]] = dict(by_position_level)
+        self.by_tag: Dict[str, List[int]] = dict(by_tag)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def score(
+        self,
+        category: Optional[str] = None,
+        tags: Iterable[str] = (),
+        position_level: Optional[str] = None,
+    ) -> Dict[int, int]:
+        """
+        Score every item that matches the profile on at least one field.
+
+        Returns a mapping of catalog position to score. Items that match
+        nothing are left out, so every returned score is positive. Passing
+        ``position_level=None`` skips the level match entirely.
+        """
+        scores: Dict[int, int] = {}
+
+        for pos in self.by_category.get(category, ()):
+            scores[pos] = CATEGORY_WEIGHT
+
+        if position_level is not None:
+            for pos in self.by_position_level.get(position_level, ()):
+                scores[pos] = scores.get(pos, 0) + POSITION_LEVEL_WEIGHT
+
+        # Each occurrence of a user tag counts, as in the original scan
+        for tag in tags:
+            for pos in self.by_tag.get(tag, ()):
+                scores[pos] = scores.get(pos, 0) + TAG_WEIGHT
+
+        return scores
+
+    def top_k(
+        self,
+        k: int,
+        category: Optional[str] = None,
+        tags: Iterable[str] = (),
+        position_level: Optional[str] = None,
+    ) -> List[Tuple[int, int]]:
+        """
+        Return up to ``k`` ``(position, score)`` pairs, best first.
+
+        Ties keep catalog order, matching a stable sort over the full catalog.
+        """
+        scores = self.score(category=category, tags=tags, position_level=position_level)
+        return heapq.nsmallest(k, scores.items(), key=lambda entry: (-entry[1], entry[0]))
@@ -0,0 +1,136 @@
+"""
+Hybrid ranking over the precomputed neighbor lists.
+
+A user's score for an assessment is a weighted sum of three signals:
+
+* content: mean ``item_similarity`` score from the user's completed assessments,
+* collaborative: mean ``collaborative`` score from the same seeds,
+* popularity: log-scaled completion count, normalized to [0, 1].
+
+Scores for a whole batch of users come from two sparse products,
+``seeds @ neighbors`` per source, so the cost grows with the number of
+neighbor entries touched rather than with one query per user. Users with
+no history fall back to the most popular assessments.
+"""
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import models
+from .ann_index import top_k
+
+# Most popular assessments offered to every user as extra candidates
+POPULAR_POOL = 100
+IN_CHUNK = 500
+
+
+class HybridWeights(NamedTuple):
+    content: float
+    collaborative: float
+    popularity: float
+
+
+def _in_chunks(query, column, values: Sequence) -> Iterator:
+    values = list(values)
+    for start in range(0, len(values), IN_CHUNK):
+        yield from query.filter(column.in_(values[start:start + IN_CHUNK]))
+
+
+def load_history(db: Session, user_ids: Sequence[int]) -> List[Tuple[int, int]]:
+    query = db.query(models.UserAssessment.user_id, models.UserAssessment.assessment_id).distinct()
+    return [tuple(row) for row in _in_chunks(query, models.UserAssessment.user_id, user_ids)]
+
+
+def load_neighbors(db: Session, seed_ids: Iterable[int], sources: Sequence[str]) -> List[Tuple[int, int, float, str]]:
+    query = db.query(
+        models.Recommendation.assessment_id,
+        models.Recommendation.recommended_assessment_id,
+        models.Recommendation.score,
+        models.Recommendation.source,
+    ).filter(models.Recommendation.source.in_(sources))
+    return [tuple(row) for row in _in_chunks(query, models.Recommendation.assessment_id, sorted(set(seed_ids)))]
+
+
+def load_popularity(db: Session, n_items: int) -> np.ndarray:
+    counts = np.zeros(n_items)
+    rows = (
+        db.query(models.UserAssessment.assessment_id, func.count(func.distinct(models.UserAssessment.user_id)))
+        .group_by(models.UserAssessment.assessment_id)
+    )
+    for assessment_id, count in rows:
+        if assessment_id < n_items:
+            counts[assessment_id] = count
+    top = counts.max() if n_items else 0
+    return np.log1p(counts) / np.log1p(top) if top > 0 else counts
+
+
+def load_active(db: Session, n_items: int) -> np.ndarray:
+    active = np.zeros(n_items, dtype=bool)
+    active[[row.id for row in db.query(models.Assessment.id).filter(models.Assessment.is_active.is_(True))]] = True
+    return active
+
+
+def hybrid_scores(
+    user_ids: Sequence[int],
+    history: Sequence[Tuple[int, int]],
+    neighbors: Sequence[Tuple[int, int, float, str]],
+    popularity: np.ndarray,
+    active: np.ndarray,
+    weights: HybridWeights,
+    sources: Tuple[str, str],
+    limit: int,
+) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    Top ``limit`` ``(assessment_id, score)`` per user, best first, ties by id.
+    Completed and inactive assessments are never returned.
+    """
+    n_items = len(active)
+    users = list(dict.fromkeys(user_ids))
+    row_of = {user_id: row for row, user_id in enumerate(users)}
+
+    history = [(row_of[u], a) for u, a in history if u in row_of and a < n_items]
+    rows = np.array([r for r, _ in history], dtype=np.int64)
+    cols = np.array([a for _, a in history], dtype=np.int64)
+    completed = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(users), n_items))
+    completed.data[:] = 1.0
+    # Each user's seeds share one unit of weight, so long histories do not dominate
+    seeds_per_user = np.asarray(completed.sum(axis=1)).ravel()
+    seeds = sparse.diags(1.0 / np.maximum(seeds_per_user, 1)) @ completed
+
+    scores = sparse.csr_matrix((len(users), n_items))
+    for source, weight in zip(sources, (weights.content, weights.collaborative)):
+        entries = [(a, r, s) for a, r, s, src in neighbors if src == source and a < n_items and r < n_items]
+        if not entries or not weight:
+            continue
+        a, r, s = (np.array(column) for column in zip(*entries))
+        matrix = sparse.csr_matrix((s.astype(float), (a.astype(np.int64), r.astype(np.int64))), shape=(n_items, n_items))
+        scores = scores + weight * (seeds @ matrix)
+    scores = scores.tocsr()
+
+    if weights.popularity:
+        # Candidates: anything a seed points at, plus the popular pool for everyone
+        pool = np.flatnonzero(active & (popularity > 0))
+        if len(pool) > POPULAR_POOL:
+            pool = pool[np.argpartition(-popularity[pool], POPULAR_POOL - 1)[:POPULAR_POOL]]
+        candidates = scores.copy()
+        candidates.data[:] = 1.0
+        pool_matrix = sparse.csr_matrix(
+            (np.ones(len(users) * len(pool)), (np.repeat(np.arange(len(users)), len(pool)), np.tile(pool, len(users)))),
+            shape=(len(users), n_items),
+        )
+        candidates = (candidates + pool_matrix).tocsr()
+        candidates.data[:] = 1.0
+        scores = (scores + candidates.multiply(weights.popularity * popularity).tocsr()).tocsr()
+
+    scores = (scores - scores.multiply(completed)).multiply(active.astype(float)).tocsr()
+    scores.eliminate_zeros()
+
+    results: Dict[int, List[Tuple[int, float]]] = {}
+    for row, user_id in enumerate(users):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        items, values = top_k(scores.data[start:end], scores.indices[start:end], limit)
+        results[user_id] = [(int(item), float(value)) for item, value in zip(items, values)]
+    return results
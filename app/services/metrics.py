@@ -0,0 +1,272 @@
+"""
+In-process metrics, served in Prometheus text format at ``/metrics``.
+
+Latencies go into fixed-bucket histograms: an observation is a bisect and
+three additions under a lock. Point-in-time values (cache hit ratios, pool
+connection counts) are not tracked on the request path at all; collectors
+read them from their owners when ``/metrics`` is scraped. Each histogram is
+also reported as p50/p95/p99 estimated from its buckets, for readers
+without PromQL's ``histogram_quantile``.
+
+With ``METRICS_ENABLED=false`` observations are dropped, ``timer`` returns
+a shared null context and the request middleware is not installed.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..config import settings
+
+# Seconds; spans cache hits (sub-millisecond) to slow upstream calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+HISTOGRAM_HELP = {
+    "app_request_duration_seconds": "HTTP request latency by route template, method and status",
+    "app_stage_duration_seconds": "Time spent in hot-path stages: catalog load, profile scoring, ranking",
+    "app_upstream_duration_seconds": "YouTube Data API call latency by endpoint and outcome",
+}
+GAUGE_HELP = {
+    "app_cache_hits": "Cache hits since process start",
+    "app_cache_misses": "Cache misses since process start",
+    "app_cache_hit_ratio": "Cache hits over lookups since process start",
+    "app_cache_entries": "Entries currently held by the cache",
+    "app_db_pool_connections": "Database pool connections by state",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+_NULL_TIMER = nullcontext()
+
+
+class Sample(NamedTuple):
+    name: str
+    labels: Dict[str, str]
+    value: float
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate, interpolating linearly inside the bucket that holds the ``q`` rank."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metrics:
+    def __init__(self, enabled: bool = True, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def timer(self, name: str, **labels: Any):
+        """Context manager observing the time spent in its block."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(name, labels)
+
+    @contextmanager
+    def _timer(self, name: str, labels: Dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Add a callable producing gauge samples at scrape time."""
+        self._collectors.append(collector)
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def _gauges(self) -> Dict[str, List[Sample]]:
+        gauges: Dict[str, List[Sample]] = {}
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                # One broken source must not take the whole scrape down
+                print(f"Error collecting metrics: {e}")
+                continue
+            for sample in samples:
+                gauges.setdefault(sample.name, []).append(sample)
+        return gauges
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            snapshot = {
+                name: [(key, list(h.counts), h.sum, h.count, [h.quantile(q) for q in QUANTILES])
+                       for key, h in series.items()]
+                for name, series in self._histograms.items()
+            }
+
+        lines: List[str] = []
+        for name in sorted(snapshot):
+            lines.append(f"# HELP {name} {HISTOGRAM_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, counts, total, count, _ in snapshot[name]:
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(key + (("le", _format_value(bound)),))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+
+            quantile_name = f"{name}_quantile"
+            lines.append(f"# HELP {quantile_name} Quantiles of {name} estimated from its buckets")
+            lines.append(f"# TYPE {quantile_name} gauge")
+            for key, _, _, _, estimates in snapshot[name]:
+                for q, estimate in zip(QUANTILES, estimates):
+                    labels = _format_labels(key + (("quantile", str(q)),))
+                    lines.append(f"{quantile_name}{labels} {_format_value(estimate)}")
+
+        gauges = self._gauges()
+        for name in sorted(gauges):
+            lines.append(f"# HELP {name} {GAUGE_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} gauge")
+            for sample in gauges[name]:
+                lines.append(f"{name}{_format_labels(_label_key(sample.labels))} {_format_value(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+
+def cache_samples(cache: str, stats: Optional[Dict[str, Any]]) -> List[Sample]:
+    """Gauges for a ``stats()`` dict with hits and misses (and optionally size or entries)."""
+    if not stats:
+        return []
+    samples = [
+        Sample("app_cache_hits", {"cache": cache}, stats.get("hits", 0)),
+        Sample("app_cache_misses", {"cache": cache}, stats.get("misses", 0)),
+        Sample("app_cache_hit_ratio", {"cache": cache}, stats.get("hit_ratio", 0.0)),
+    ]
+    entries = stats.get("size", stats.get("entries"))
+    if entries is not None:
+        samples.append(Sample("app_cache_entries", {"cache": cache}, entries))
+    return samples
+
+
+def pool_samples(engine: str, status: Dict[str, Any]) -> List[Sample]:
+    """Gauges for a ``database.pool_status`` dict."""
+    return [
+        Sample("app_db_pool_connections", {"engine": engine, "pool": status["pool"], "state": state}, status[state])
+        for state in ("size", "checked_in", "checked_out", "overflow")
+    ]
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by route template.
+
+    Plain ASGI rather than ``BaseHTTPMiddleware``, which would add a task
+    and a stream per request. Paths that match no route share one
+    ``<unmatched>`` label so scanners cannot blow up the series count.
+    """
+
+    def __init__(self, app, registry: "Metrics"):
+        self.app = app
+        self.registry = registry
+        self._prefixes: Dict[int, str] = {}
+
+    def _route_template(self, scope) -> str:
+        """
+        Full path template of the matched route. Routes of an included router
+        only know their path relative to its prefix, so the prefix is recovered
+        once per route from the request path and then reused.
+        """
+        route = scope.get("route")
+        template = getattr(route, "path", None)
+        if template is None:
+            return "<unmatched>"
+        path = scope["path"]
+        prefix = self._prefixes.get(id(route))
+        if prefix is None or not path.startswith(prefix) or not route.path_regex.match(path[len(prefix):]):
+            prefix = next(
+                (path[:i] for i in range(len(path)) if path[i] == "/" and route.path_regex.match(path[i:])),
+                "",
+            )
+            self._prefixes[id(route)] = prefix
+        return prefix + template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.observe(
+                "app_request_duration_seconds", time.perf_counter() - start,
+                route=self._route_template(scope), method=scope["method"], status=status,
+            )
+
+
+metrics = Metrics(enabled=settings.METRICS_ENABLED)
@@ -0,0 +1,50 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table
+
+# Upper bound on page size for every list endpoint
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque cursor for the page after ``last_id``."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """The id a cursor resumes after; raises ValueError for malformed cursors."""
+    if not cursor:
+        return None
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = json.loads(payload)["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid cursor")
+    return last_id
+
+
+def projection(table: Table, fields: Optional[str], allowed: Sequence[str], default: Sequence[str]) -> List:
+    """
+    Columns of ``table`` for a comma-separated ``fields`` request.
+
+    ``id`` is always included since it is the pagination key. Raises
+    ValueError naming any field outside ``allowed``.
+    """
+    names = [name.strip() for name in fields.split(",") if name.strip()] if fields else list(default)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    names = ["id"] + [name for name in dict.fromkeys(names) if name != "id"]
+    return [table.c[name] for name in names]
+
+
+def page(rows: Sequence[Any], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Split a ``limit + 1`` row fetch into the page items and the next cursor."""
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(items[-1]["id"]) if len(rows) > limit else None
+    return items, next_cursor
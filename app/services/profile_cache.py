@@ -0,0 +1,182 @@
+"""
+Memoized scoring for questionnaire profiles.
+
+The questionnaire has a small answer space (one expertise, a handful of
+skills, one position level) and most users land on a few common
+combinations. Profiles are canonicalized to ``(category, sorted distinct
+skills, position level)`` so answer order does not split the cache, and
+entries are keyed on the profile plus the catalog file key, so a catalog
+reload is never served stale scores. Each entry holds the matched
+positions and their scores as two ``int32`` arrays (what the display
+ranking works on) and the best ``RANKED_DEPTH`` positions already
+ranked, so a repeat ``top_k`` is a dictionary lookup and a slice. The LRU
+is bounded by the bytes those arrays take as well as by entry count.
+
+``python -m app.jobs.profile_warmup`` precomputes the most common profiles
+into ``PROFILE_CACHE_PATH``; the cache seeds itself from that file the
+first time it sees the catalog it was built from.
+"""
+import os
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import joblib
+import numpy as np
+
+from ..config import settings
+from .ann_index import top_k
+from .catalog_cache import CatalogCache, catalog_cache
+from .catalog_index import CatalogIndex
+from .lru_cache import LRUCache
+from .metrics import metrics
+
+FORMAT_VERSION = 2
+# Positions ranked up front per profile; deeper top_k requests rank from the score arrays
+RANKED_DEPTH = 50
+# Rough size of one ranked (position, score) pair: a tuple and two small ints
+RANKED_PAIR_BYTES = 120
+
+Profile = Tuple[Optional[str], Tuple[str, ...], Optional[str]]
+
+
+class ProfileScores(NamedTuple):
+    positions: np.ndarray  # int32 catalog positions of every matched item
+    scores: np.ndarray  # int32 index score of each
+    ranked: List[Tuple[int, int]]
+
+    @property
+    def nbytes(self) -> int:
+        return self.positions.nbytes + self.scores.nbytes + RANKED_PAIR_BYTES * len(self.ranked)
+
+
+def _ranked(positions: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[int, int]]:
+    top_positions, top_scores = top_k(scores, positions, k)
+    return list(zip(top_positions.tolist(), top_scores.tolist()))
+
+
+def canonical_profile(
+    category: Optional[str] = None,
+    skills: Iterable[str] = (),
+    position_level: Optional[str] = None,
+) -> Profile:
+    """Cache key for a profile; skill order and repeats do not matter, and blanks mean "unset"."""
+    return (category or None, tuple(sorted(set(skills or ()))), position_level or None)
+
+
+def score_profile(index: CatalogIndex, profile: Profile) -> ProfileScores:
+    category, skills, position_level = profile
+    scores = index.score(category=category, tags=skills, position_level=position_level)
+    positions = np.fromiter(scores.keys(), dtype=np.int32, count=len(scores))
+    values = np.fromiter(scores.values(), dtype=np.int32, count=len(scores))
+    return ProfileScores(positions, values, _ranked(positions, values, RANKED_DEPTH))
+
+
+def _source_key(file_key: Tuple[str, int, int]) -> Tuple[int, int]:
+    _, mtime_ns, size = file_key
+    return (size, mtime_ns)
+
+
+def save_profiles(path: str, file_key: Tuple[str, int, int], entries: Dict[Profile, ProfileScores]) -> None:
+    state = {
+        "version": FORMAT_VERSION,
+        "source_key": _source_key(file_key),
+        "profiles": {profile: tuple(entry) for profile, entry in entries.items()},
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_profiles(path: str, file_key: Tuple[str, int, int]) -> Dict[Profile, ProfileScores]:
+    """Precomputed entries from ``path``, or none if it is missing, unreadable or for another catalog."""
+    try:
+        state = joblib.load(path)
+    except (OSError, EOFError, ValueError):
+        return {}
+    if state.get("version") != FORMAT_VERSION or state.get("source_key") != _source_key(file_key):
+        return {}
+    return {profile: ProfileScores(*entry) for profile, entry in state["profiles"].items()}
+
+
+class ProfileCache:
+    """LRU of scored profiles over the process-wide catalog cache."""
+
+    def __init__(
+        self,
+        maxsize: int = settings.PROFILE_CACHE_MAX_ENTRIES,
+        state_path: Optional[str] = settings.PROFILE_CACHE_PATH,
+        catalogs: CatalogCache = catalog_cache,
+        max_bytes: int = settings.PROFILE_CACHE_MAX_MB * 2 ** 20,
+    ):
+        self.state_path = state_path
+        self.catalogs = catalogs
+        self.memory = LRUCache(maxsize=maxsize, max_weight=max_bytes, weigher=lambda entry: entry.nbytes)
+        self._seeded: Set[Tuple[str, int, int]] = set()
+        self._lock = threading.Lock()
+        self.preloaded = 0
+
+    def _seed(self, file_key: Tuple[str, int, int]) -> None:
+        with self._lock:
+            if file_key in self._seeded:
+                return
+            self._seeded.add(file_key)
+            if not self.state_path:
+                return
+            entries = load_profiles(self.state_path, file_key)
+            # The file lists the most common profiles first; take those that fit in
+            # half the cache, leaving the rest for live traffic
+            seeded, total = [], 0
+            for profile, entry in entries.items():
+                total += entry.nbytes
+                if len(seeded) >= self.memory.maxsize // 2 or total > self.memory.max_weight // 2:
+                    break
+                seeded.append((profile, entry))
+            # Most common last, so they are the last to be evicted
+            for profile, entry in reversed(seeded):
+                self.memory.set((file_key, profile), entry)
+            self.preloaded += len(seeded)
+
+    def get(
+        self,
+        catalog_path: str,
+        category: Optional[str] = None,
+        skills: Iterable[str] = (),
+        position_level: Optional[str] = None,
+    ) -> ProfileScores:
+        """Scores for a profile, computed once per catalog version while it stays in the LRU."""
+        entry = self.catalogs.get(catalog_path)
+        if entry.key not in self._seeded:
+            self._seed(entry.key)
+        profile = canonical_profile(category, skills, position_level)
+        key = (entry.key, profile)
+        scored = self.memory.get(key)
+        if scored is None:
+            with metrics.timer("app_stage_duration_seconds", stage="profile_score"):
+                scored = score_profile(entry.index, profile)
+            self.memory.set(key, scored)
+        return scored
+
+    def top_k(
+        self,
+        catalog_path: str,
+        k: int,
+        category: Optional[str] = None,
+        skills: Iterable[str] = (),
+        position_level: Optional[str] = None,
+    ) -> List[Tuple[int, int]]:
+        """Up to ``k`` ``(position, score)`` pairs, best first, ties in catalog order."""
+        scored = self.get(catalog_path, category, skills, position_level)
+        if k <= RANKED_DEPTH:
+            return scored.ranked[:k]
+        return _ranked(scored.positions, scored.scores, k)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.memory.clear()
+            self._seeded.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.memory.stats(), preloaded=self.preloaded)
+
+
+profile_cache = ProfileCache()
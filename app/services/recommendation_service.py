@@ -1,14 +1,115 @@
-from typing import List, Optional
-from ..services.youtube_service import YouTubeService
-from ..models import schemas
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from ..config import settings
+from ..models import models, schemas
+from . import hybrid_ranker
+from .catalog_cache import catalog_cache
+from .metrics import metrics
+from .scoring_engine import scoring_engine
+from .text_index import text_index_cache
+
+CONTENT_SOURCE = "content"
+COLLABORATIVE_SOURCE = "collaborative"
 
-# Stub recommendation service logic
 class RecommendationService:
-    def __init__(self):
-        pass
+    """
+    Serves recommendations precomputed by the offline jobs in ``app.jobs``.
+
+    Recommendation lookups are one indexed read of the ``recommendations``
+    table on (assessment_id, source, score); nothing is scored online.
+    ``source`` picks the job: ``"content"`` (``item_similarity``) or
+    ``"collaborative"`` (``collaborative``).
+    """
+
+    def __init__(self, source: str = CONTENT_SOURCE, weights: Optional[hybrid_ranker.HybridWeights] = None):
+        self.source = source
+        self.weights = weights or hybrid_ranker.HybridWeights(
+            content=settings.HYBRID_CONTENT_WEIGHT,
+            collaborative=settings.HYBRID_COLLABORATIVE_WEIGHT,
+            popularity=settings.HYBRID_POPULARITY_WEIGHT,
+        )
+
+    def get_recommendations(
+        self,
+        db: Session,
+        user_id: int,
+        assessment_id: Optional[int] = None,
+        limit: int = 5,
+        source: Optional[str] = None,
+    ) -> List[models.Recommendation]:
+        # Without an explicit seed, recommend from the user's latest completed assessment
+        if assessment_id is None:
+            assessment_id = (
+                db.query(models.UserAssessment.assessment_id)
+                .filter(models.UserAssessment.user_id == user_id)
+                .order_by(models.UserAssessment.completed_at.desc(), models.UserAssessment.id.desc())
+                .limit(1)
+                .scalar()
+            )
+            if assessment_id is None:
+                return []
+
+        return (
+            db.query(models.Recommendation)
+            .options(joinedload(models.Recommendation.recommended_assessment))
+            .filter(
+                models.Recommendation.assessment_id == assessment_id,
+                models.Recommendation.source == (source or self.source),
+            )
+            .order_by(models.Recommendation.score.desc(), models.Recommendation.recommended_assessment_id)
+            .limit(limit)
+            .all()
+        )
+
+    def recommend(self, db: Session, request: schemas.RecommendationRequest) -> schemas.RecommendationResponse:
+        source = request.source.value if request.source is not None else None
+        recommendations = self.get_recommendations(db, request.user_id, request.assessment_id, request.limit, source)
+        return schemas.RecommendationResponse(
+            recommendations=[
+                schemas.RecommendationItem(
+                    assessment_id=rec.recommended_assessment_id,
+                    score=rec.score,
+                    reason=rec.reason,
+                    assessment=rec.recommended_assessment,
+                )
+                for rec in recommendations
+            ]
+        )
+
+    def score_batch(self, db: Session, user_ids: Sequence[int], limit: int = 5) -> Dict[int, List[Tuple[int, float]]]:
+        """
+        Hybrid top-``limit`` ``(assessment_id, score)`` lists for many users at
+        once: a handful of bulk reads, then sparse matrix products (see
+        ``hybrid_ranker``). Already-completed assessments are excluded.
+        """
+        with metrics.timer("app_stage_duration_seconds", stage="batch_load"):
+            n_items = (db.query(func.max(models.Assessment.id)).scalar() or 0) + 1
+            history = hybrid_ranker.load_history(db, user_ids)
+            sources = (CONTENT_SOURCE, COLLABORATIVE_SOURCE)
+            neighbors = hybrid_ranker.load_neighbors(db, (a for _, a in history), sources)
+            popularity, active = hybrid_ranker.load_popularity(db, n_items), hybrid_ranker.load_active(db, n_items)
+        with metrics.timer("app_stage_duration_seconds", stage="batch_score"):
+            return hybrid_ranker.hybrid_scores(
+                user_ids, history, neighbors, popularity, active, self.weights, sources, limit,
+            )
+
+    def search_catalog(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Free-text catalog search through the text index (ANN-backed when enabled)."""
+        catalog = catalog_cache.get_catalog(settings.CATALOG_PATH)
+        index = text_index_cache.get(catalog, settings.CATALOG_PATH)
+        with metrics.timer("app_stage_duration_seconds", stage="catalog_search"):
+            ranked = index.search(query, k)
+        return [dict(catalog[pos], score=score) for pos, score in ranked]
 
-    def get_recommendations(self, user_id: int):
-        # Stub implementation
-        return []
+    def recommend_profile(
+        self,
+        category: Optional[str] = None,
+        skills: Sequence[str] = (),
+        position_level: Optional[str] = None,
+        k: int = 3,
+    ) -> List[Dict[str, Any]]:
+        """Best catalog matches for a questionnaire profile, memoized per canonical profile."""
+        return scoring_engine.top_k(k, category, skills, position_level)
 
 recommendation_service = RecommendationService()
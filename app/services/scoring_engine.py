@@ -0,0 +1,183 @@
+"""
+One scoring entry point for the Streamlit UI, the API and the batch predictor.
+
+Every caller ranks the catalog through ``CatalogIndex`` weights, reads
+the catalog and its index from the process-wide ``catalog_cache`` and
+reads profile scores from the memoized ``profile_cache``, so indexes are
+built once per server process however many sessions or reruns ask.
+``recommend`` adds the questionnaire's display scoring (match percentage
+plus a small per-item bonus); ``top_k`` and ``best_title`` return the plain
+ranking.
+
+The bonus is a hash of (canonical profile, item id, seed) rather than a
+random draw, so the ordering still varies from one profile to the next
+while a given profile always gets the same results. Results are memoized
+here and can be cached by any layer in front; ``RECOMMENDATION_JITTER=0``
+drops the bonus and ranks on the index score alone.
+"""
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .ann_index import top_k
+from .catalog_cache import CatalogEntry
+from .catalog_index import catalog_column
+from .lru_cache import LRUCache
+from .metrics import metrics
+from .profile_cache import Profile, ProfileCache, canonical_profile, profile_cache
+
+# Display match of an unmatched item before its bonus, and the lowest a matched item can show
+UNMATCHED_MATCH = 20
+MIN_MATCHED_MATCH = 35
+
+# Shown when nothing in the catalog matches, or there is no catalog
+FALLBACK_TITLE = "General Software Engineering"
+FALLBACK_RECOMMENDATION = {
+    "title": FALLBACK_TITLE,
+    "type": "Course",
+    "provider": "SHL Academy",
+    "match": "80%",
+    "description": "A comprehensive guide to software development principles.",
+}
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def profile_hash(profile: Profile, seed: str = "") -> int:
+    return _hash64(f"{seed}\x1f{profile!r}")
+
+
+def item_hashes(item_ids: Sequence[Any]) -> np.ndarray:
+    return np.fromiter((_hash64(str(item_id)) for item_id in item_ids), dtype=np.uint64, count=len(item_ids))
+
+
+def bonuses(profile_key: int, hashes: np.ndarray, spread: int) -> np.ndarray:
+    """Per-item bonuses in ``[0, spread]``: a splitmix64 mix of the item and profile hashes."""
+    if spread <= 0:
+        return np.zeros(len(hashes), dtype=np.int64)
+    x = hashes ^ np.uint64(profile_key)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x = x ^ (x >> np.uint64(31))
+    return (x % np.uint64(spread + 1)).astype(np.int64)
+
+
+def jitter(profile: Profile, item_id: Any, spread: int, seed: str = "") -> int:
+    """Bonus in ``[0, spread]`` for an item under a profile; the same inputs always give the same bonus."""
+    return int(bonuses(profile_hash(profile, seed), item_hashes([item_id]), spread)[0])
+
+
+def _copy_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    # Catalog items are flat apart from list fields (tags) holding strings
+    return {key: value.copy() if isinstance(value, (list, dict)) else value for key, value in item.items()}
+
+
+class ScoringEngine:
+    def __init__(
+        self,
+        catalog_path: str = settings.CATALOG_PATH,
+        profiles: ProfileCache = profile_cache,
+        jitter: int = settings.RECOMMENDATION_JITTER,
+        seed: str = settings.RECOMMENDATION_JITTER_SEED,
+    ):
+        self.catalog_path = catalog_path
+        self.profiles = profiles
+        self.jitter = jitter
+        self.seed = seed
+        self.results = LRUCache(maxsize=profiles.memory.maxsize)
+        self._hashes: Optional[Tuple[Tuple[str, int, int], np.ndarray]] = None
+
+    @property
+    def catalog(self) -> Sequence:
+        # The profile cache reads through the same catalog cache, so both see one version
+        return self.profiles.catalogs.get_catalog(self.catalog_path)
+
+    def top_k(
+        self,
+        k: int,
+        category: Optional[str] = None,
+        skills: Iterable[str] = (),
+        position_level: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Up to ``k`` catalog items with their index score, best first."""
+        catalog = self.catalog
+        ranked = self.profiles.top_k(self.catalog_path, k, category, skills, position_level)
+        return [dict(catalog[pos], score=score) for pos, score in ranked]
+
+    def best_title(self, category: Optional[str] = None, skills: Iterable[str] = ()) -> str:
+        """Title of the single best match on category and skills, as the batch predictor reports it."""
+        best = self.top_k(1, category, skills)
+        return best[0]["title"] if best else FALLBACK_TITLE
+
+    def recommend(
+        self,
+        category: Optional[str] = None,
+        skills: Iterable[str] = (),
+        position_level: Optional[str] = None,
+        k: int = 3,
+    ) -> List[Dict[str, Any]]:
+        """
+        The questionnaire's top ``k`` display entries, each carrying a
+        ``match`` percentage and ``type``; falls back to a general course.
+        Identical profiles get identical results, served from memory after the first.
+        """
+        profile = canonical_profile(category, skills, position_level)
+        entry = self.profiles.catalogs.get(self.catalog_path)
+        key = (entry.key, profile, k)
+        recommendations = self.results.get(key)
+        if recommendations is None:
+            with metrics.timer("app_stage_duration_seconds", stage="recommend_rank"):
+                recommendations = self._recommend(entry, profile, k)
+            self.results.set(key, recommendations)
+        # Callers may annotate their copies, tag lists included; the memoized entries stay untouched
+        return [_copy_item(rec) for rec in recommendations]
+
+    def _item_hashes(self, entry: CatalogEntry) -> np.ndarray:
+        """Hash of every item id, computed once per catalog version."""
+        cached = self._hashes
+        if cached is None or cached[0] != entry.key:
+            ids = [pos if item_id is None else item_id for pos, item_id in enumerate(catalog_column(entry.catalog, "id"))]
+            cached = (entry.key, item_hashes(ids))
+            self._hashes = cached
+        return cached[1]
+
+    def _recommend(self, entry: CatalogEntry, profile: Profile, k: int) -> List[Dict[str, Any]]:
+        catalog, index = entry.catalog, entry.index
+        scored = self.profiles.get(self.catalog_path, *profile)
+        positions, values = scored.positions, scored.scores
+
+        # Unmatched items only score their bonus, at most 20 + jitter percent. While that
+        # ranks below every matched item (at least 35%: one skill, out of category), they
+        # are only needed to fill the top k; a larger jitter scores the whole catalog
+        if len(positions) < k or UNMATCHED_MATCH + self.jitter >= MIN_MATCHED_MATCH:
+            matched_values = np.zeros(len(catalog), dtype=np.int64)
+            matched_values[positions] = values
+            positions, values = np.arange(len(catalog)), matched_values
+
+        if self.jitter > 0:
+            # Add a per-profile bonus for variation in generic scores
+            hashes = self._item_hashes(entry)[positions]
+            values = values + bonuses(profile_hash(profile, self.seed), hashes, self.jitter)
+
+        in_category = np.zeros(len(catalog), dtype=bool)
+        in_category[index.by_category.get(profile[0], [])] = True
+        matches = np.where(in_category[positions], np.minimum(99, 50 + values), np.minimum(80, 20 + values))
+        keep = values > 0
+        # Ties go to the lower catalog position, as in the original ranking
+        winners, winner_matches = top_k(matches[keep], positions[keep], k)
+
+        # Only the k winners are materialized and formatted
+        recommendations = []
+        for pos, match_percentage in zip(winners.tolist(), winner_matches.tolist()):
+            item_copy = dict(catalog[pos])
+            item_copy["match"] = f"{match_percentage}%"
+            item_copy["type"] = "Assessment"  # Default type
+            recommendations.append(item_copy)
+        return recommendations or [dict(FALLBACK_RECOMMENDATION)]
+
+
+scoring_engine = ScoringEngine()
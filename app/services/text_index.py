@@ -0,0 +1,270 @@
+"""
+Free-text retrieval over catalog titles, descriptions, categories and tags.
+
+``TextIndex`` holds a fitted TF-IDF vectorizer and either the sparse,
+L2-normalized item matrix or a truncated-SVD dense projection of it.
+Queries are weighted straight from the fitted vocabulary and scored only
+against the posting columns of their terms (or one dense matrix-vector
+product with SVD), so top-k stays well under a millisecond. The index is
+persisted next to the catalog with joblib and loaded once per process;
+when the catalog only gained entries, the new items are folded in with
+the existing vocabulary instead of refitting.
+"""
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from ..config import settings
+from .ann_index import build_ann_index, top_k
+from .catalog_index import catalog_column, catalog_tag_lists
+
+FORMAT_VERSION = 1
+# Refit from scratch once appended items exceed this share of the index,
+# since their terms are missing from the vocabulary and IDF weights
+REFIT_RATIO = 0.2
+
+
+def catalog_texts(catalog: Sequence) -> List[str]:
+    columns = zip(
+        catalog_column(catalog, "title"),
+        catalog_column(catalog, "description"),
+        catalog_column(catalog, "category"),
+        catalog_tag_lists(catalog),
+    )
+    return [" ".join(filter(None, [title, description, category, " ".join(tags)])) for title, description, category, tags in columns]
+
+
+class TextIndex:
+    def __init__(
+        self,
+        vectorizer: TfidfVectorizer,
+        vectors: Any,
+        ids: List[Optional[str]],
+        svd: Optional[TruncatedSVD] = None,
+        fitted_size: Optional[int] = None,
+    ):
+        self.vectorizer = vectorizer
+        self.vectors = vectors  # items x terms CSR, or items x components ndarray with SVD
+        self.ids = ids
+        self.svd = svd
+        self.fitted_size = fitted_size if fitted_size is not None else len(ids)
+        self.source_key: Optional[Tuple[int, int]] = None
+        self.ann = None
+        self._ann_backend: Optional[str] = None
+        self._prepare()
+
+    def _prepare(self) -> None:
+        # Query-time lookups, derived from the fitted vectorizer rather than persisted
+        self._analyzer = self.vectorizer.build_analyzer()
+        self._vocabulary = self.vectorizer.vocabulary_
+        self._idf = self.vectorizer.idf_
+        self._by_term = self.vectors.tocsc() if self.svd is None else None
+
+    def use_ann(self, backend: Optional[str]) -> None:
+        """Serve dense (SVD) queries through an ANN backend; ``None`` keeps exact search."""
+        if backend and self.svd is None:
+            print(f"Warning: ANN backend {backend!r} ignored; it needs TEXT_INDEX_COMPONENTS > 0 (an SVD index)")
+        self._ann_backend = backend if self.svd is not None else None
+        self.ann = build_ann_index(self.vectors, backend) if self._ann_backend else None
+
+    @classmethod
+    def build(cls, catalog: Sequence, n_components: Optional[int] = None) -> "TextIndex":
+        """Fit a new index. ``n_components`` switches to a dense truncated-SVD index."""
+        vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True)
+        matrix = vectorizer.fit_transform(catalog_texts(catalog))
+        svd = None
+        vectors = matrix.tocsr()
+        if n_components:
+            n_components = min(n_components, matrix.shape[1] - 1)
+            svd = TruncatedSVD(n_components=n_components, random_state=0)
+            vectors = normalize(svd.fit_transform(matrix)).astype(np.float32)
+        return cls(vectorizer, vectors, catalog_column(catalog, "id"), svd)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _encode(self, texts: List[str]):
+        matrix = self.vectorizer.transform(texts)
+        if self.svd is None:
+            return matrix.tocsr()
+        return normalize(self.svd.transform(matrix)).astype(np.float32)
+
+    def add(self, items: Sequence) -> None:
+        """Append new catalog items, reusing the fitted vocabulary."""
+        if not len(items):
+            return
+        vectors = self._encode(catalog_texts(items))
+        if self.svd is None:
+            self.vectors = sparse.vstack([self.vectors, vectors], format="csr")
+            self._by_term = self.vectors.tocsc()
+        else:
+            self.vectors = np.vstack([self.vectors, vectors])
+            self.use_ann(self._ann_backend)
+        self.ids.extend(catalog_column(items, "id"))
+
+    @property
+    def needs_refit(self) -> bool:
+        return len(self.ids) > self.fitted_size * (1 + REFIT_RATIO)
+
+    def _query_weights(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """TF-IDF weights of a query, identical to ``vectorizer.transform`` but without its overhead."""
+        counts: Dict[int, int] = {}
+        for term in self._analyzer(query):
+            term_id = self._vocabulary.get(term)
+            if term_id is not None:
+                counts[term_id] = counts.get(term_id, 0) + 1
+        term_ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        weights = (1.0 + np.log(tf)) * self._idf[term_ids]  # sublinear_tf
+        norm = np.linalg.norm(weights)
+        return term_ids, (weights / norm if norm else weights)
+
+    def _project(self, term_ids: np.ndarray, weights: np.ndarray) -> Optional[np.ndarray]:
+        q = weights @ self.svd.components_[:, term_ids].T
+        norm = np.linalg.norm(q)
+        return (q / norm).astype(np.float32) if norm else None
+
+    def query_vector(self, query: str) -> Optional[np.ndarray]:
+        """Unit-norm dense vector for ``query`` in an SVD index, or None if no term is known."""
+        term_ids, weights = self._query_weights(query)
+        return self._project(term_ids, weights) if len(term_ids) else None
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(position, cosine score)`` pairs, best first, skipping zero scores."""
+        term_ids, weights = self._query_weights(query)
+        if k <= 0 or not len(term_ids):
+            return []
+
+        if self.svd is None:
+            # Only items sharing a query term can score, so sum just their posting columns
+            by_term = self._by_term
+            starts, ends = by_term.indptr[term_ids], by_term.indptr[term_ids + 1]
+            positions = np.concatenate([by_term.indices[a:b] for a, b in zip(starts, ends)])
+            if not len(positions):
+                return []
+            contributions = np.concatenate(
+                [by_term.data[a:b] * w for a, b, w in zip(starts, ends, weights)]
+            )
+            positions, inverse = np.unique(positions, return_inverse=True)
+            scores = np.bincount(inverse, weights=contributions)
+        else:
+            q = self._project(term_ids, weights)
+            if q is None:
+                return []
+            if self.ann is not None:
+                positions, scores = self.ann.search(q, k)
+                return [(int(pos), float(score)) for pos, score in zip(positions, scores) if score > 0]
+            scores = self.vectors @ q
+            positions = np.arange(len(scores))
+
+        # Ties go to the earlier catalog entry
+        positions, scores = top_k(scores, positions, k)
+        return [(int(pos), float(score)) for pos, score in zip(positions, scores) if score > 0]
+
+    def save(self, path: str) -> None:
+        state = {
+            "version": FORMAT_VERSION,
+            "vectorizer": self.vectorizer,
+            "vectors": self.vectors,
+            "ids": self.ids,
+            "svd": self.svd,
+            "fitted_size": self.fitted_size,
+            "source_key": self.source_key,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TextIndex":
+        state = joblib.load(path)
+        if state.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} has an unsupported text index version")
+        index = cls(state["vectorizer"], state["vectors"], state["ids"], state["svd"], state["fitted_size"])
+        index.source_key = state["source_key"]
+        return index
+
+
+def default_index_path(catalog_path: str) -> str:
+    return os.path.splitext(catalog_path)[0] + ".text_index.joblib"
+
+
+def load_or_build(
+    catalog: Sequence,
+    catalog_path: str,
+    index_path: Optional[str] = None,
+    n_components: Optional[int] = None,
+) -> TextIndex:
+    """
+    Return the persisted index for ``catalog_path``, updating it if the catalog changed.
+
+    Appended entries are folded in incrementally; any other change, or too
+    many appended entries, triggers a full refit. The result is saved back.
+    """
+    index_path = index_path or default_index_path(catalog_path)
+    stat = os.stat(catalog_path)
+    source_key = (stat.st_size, stat.st_mtime_ns)
+
+    index = None
+    try:
+        index = TextIndex.load(index_path)
+    except (OSError, ValueError, KeyError, EOFError):
+        index = None
+
+    if index is not None and index.source_key == source_key:
+        return index
+
+    ids = catalog_column(catalog, "id")
+    wanted_dense = bool(n_components)
+    if (
+        index is not None
+        and (index.svd is not None) == wanted_dense
+        and ids[:len(index.ids)] == index.ids
+    ):
+        index.add(catalog[len(index.ids):])
+        if index.needs_refit:
+            index = TextIndex.build(catalog, n_components)
+    else:
+        index = TextIndex.build(catalog, n_components)
+
+    index.source_key = source_key
+    try:
+        index.save(index_path)
+    except OSError:
+        pass  # read-only deployments still get the in-memory index
+    return index
+
+
+class TextIndexCache:
+    """Keeps one TextIndex per catalog file, refreshed when the catalog changes."""
+
+    def __init__(self, n_components: Optional[int] = None, ann_backend: Optional[str] = None):
+        self.n_components = n_components
+        self.ann_backend = ann_backend
+        self._indexes: Dict[str, TextIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, catalog: Sequence, catalog_path: str) -> TextIndex:
+        catalog_path = os.path.abspath(catalog_path)
+        stat = os.stat(catalog_path)
+        index = self._indexes.get(catalog_path)
+        if index is not None and index.source_key == (stat.st_size, stat.st_mtime_ns):
+            return index
+        with self._lock:
+            index = load_or_build(catalog, catalog_path, n_components=self.n_components)
+            index.use_ann(self.ann_backend)
+            self._indexes[catalog_path] = index
+            return index
+
+
+text_index_cache = TextIndexCache(
+    n_components=settings.TEXT_INDEX_COMPONENTS or None,
+    ann_backend=settings.ANN_BACKEND if settings.ANN_ENABLED else None,
+)
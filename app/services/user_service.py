@@ -1,5 +1,42 @@
-# Stub user service
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import models
+from .pagination import page, projection
+
+# Columns a list request may select; hashed_password is never exposed
+USER_FIELDS = ("id", "email", "full_name", "is_active", "is_superuser", "created_at", "updated_at")
+USER_LIST_FIELDS = ("id", "email", "full_name", "is_active")
+
+
 class UserService:
-    pass
+    """User reads for the async routes; queries are awaited on an ``AsyncSession``."""
+
+    async def get_user(self, db: AsyncSession, user_id: int) -> Optional[models.User]:
+        return await db.get(models.User, user_id)
+
+    async def list_users(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One keyset page of users ordered by id, as plain dicts of the
+        requested ``fields``, plus the cursor of the next page (or None).
+        """
+        table = models.User.__table__
+        query = select(*projection(table, fields, USER_FIELDS, USER_LIST_FIELDS))
+        if after_id is not None:
+            query = query.where(table.c.id > after_id)
+        if is_active is not None:
+            query = query.where(table.c.is_active.is_(is_active))
+        result = await db.execute(query.order_by(table.c.id).limit(limit + 1))
+        return page(result.mappings().all(), limit)
+
 
 user_service = UserService()
@@ -0,0 +1,157 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models import models
+from ..models.database import SessionLocal, bulk_upsert
+from .lru_cache import LRUCache
+
+# Snippet fields a search refreshes; enrichment-owned columns (duration, counts, tags) are left alone
+SNIPPET_COLUMNS = ["title", "description", "published_at", "channel_id", "channel_title", "thumbnail_url"]
+# Leading tags appended to a catalog title to form its video search
+CATALOG_QUERY_TAGS = 3
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def catalog_query(item: Dict[str, Any]) -> str:
+    """The search issued for a catalog entry's video previews (warm-up and render time alike)."""
+    return " ".join([item["title"]] + list(item.get("tags") or [])[:CATALOG_QUERY_TAGS])
+
+
+def video_from_row(row: models.YouTubeVideo) -> Dict[str, Any]:
+    return {
+        'video_id': row.id,
+        'title': row.title,
+        'description': row.description,
+        'published_at': row.published_at,
+        'channel_id': row.channel_id,
+        'channel_title': row.channel_title,
+        'thumbnail_url': row.thumbnail_url,
+        'duration': row.duration,
+        'view_count': row.view_count,
+        'like_count': row.like_count,
+        'category': row.category,
+        'tags': row.tags,
+    }
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class YouTubeSearchCache:
+    """
+    Two-tier cache in front of YouTube searches.
+
+    Tier one is an in-process LRU bounded by size and TTL. Tier two persists
+    results: videos are upserted into ``youtube_videos`` and the ordered ids
+    per normalized query into ``youtube_queries``, so warm results survive
+    restarts and are shared by every worker. A hit on either tier never
+    touches the network. Database work runs in a thread so the event loop
+    is not blocked.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 6 * 3600,
+        persist: bool = True,
+        session_factory: Callable = SessionLocal,
+    ):
+        self.ttl = ttl
+        self.persist = persist
+        self.session_factory = session_factory
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.db_hits = 0
+        self.db_misses = 0
+
+    @staticmethod
+    def key(query: str, max_results: int) -> Tuple[str, int]:
+        return normalize_query(query), max_results
+
+    @staticmethod
+    def db_key(key: Tuple[str, int]) -> str:
+        return f"{key[1]}:{key[0]}"
+
+    async def get(self, query: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+        key = self.key(query, max_results)
+        videos = self.memory.get(key)
+        if videos is not None or not self.persist:
+            return videos
+
+        videos = await asyncio.to_thread(self._load, key)
+        if videos is None:
+            self.db_misses += 1
+            return None
+        self.db_hits += 1
+        self.memory.set(key, videos)
+        return videos
+
+    async def set(self, query: str, max_results: int, videos: List[Dict[str, Any]]) -> None:
+        key = self.key(query, max_results)
+        self.memory.set(key, videos)
+        if self.persist:
+            await asyncio.to_thread(self._store, key, query, videos)
+
+    def _load(self, key: Tuple[str, int]) -> Optional[List[Dict[str, Any]]]:
+        db = self.session_factory()
+        try:
+            row = db.get(models.YouTubeQuery, self.db_key(key))
+            if row is None:
+                return None
+            if _as_utc(row.fetched_at) + timedelta(seconds=self.ttl) < datetime.now(timezone.utc):
+                return None
+            videos = {
+                video.id: video
+                for video in db.query(models.YouTubeVideo).filter(models.YouTubeVideo.id.in_(row.video_ids))
+            }
+            # A video that has since been purged makes the stored result unusable
+            if any(video_id not in videos for video_id in row.video_ids):
+                return None
+            return [video_from_row(videos[video_id]) for video_id in row.video_ids]
+        finally:
+            db.close()
+
+    def _store(self, key: Tuple[str, int], query: str, videos: List[Dict[str, Any]]) -> None:
+        db = self.session_factory()
+        try:
+            bulk_upsert(
+                db,
+                models.YouTubeVideo,
+                [
+                    {"id": video["video_id"], **{column: video.get(column) for column in SNIPPET_COLUMNS}}
+                    for video in {video["video_id"]: video for video in videos}.values()
+                ],
+                key_columns=["id"],
+                update_columns=SNIPPET_COLUMNS,
+            )
+            bulk_upsert(
+                db,
+                models.YouTubeQuery,
+                [{
+                    "query_key": self.db_key(key),
+                    "query": query,
+                    "max_results": key[1],
+                    "video_ids": [video["video_id"] for video in videos],
+                    "fetched_at": datetime.now(timezone.utc),
+                }],
+                key_columns=["query_key"],
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self.memory.stats()
+        lookups = memory["hits"] + memory["misses"]
+        hits = memory["hits"] + self.db_hits
+        return {
+            "memory": memory,
+            "db_hits": self.db_hits,
+            "db_misses": self.db_misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
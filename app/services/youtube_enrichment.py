@@ -0,0 +1,191 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..models import models
+from ..models.database import SessionLocal, bulk_upsert
+from .lru_cache import LRUCache
+from .youtube_cache import SNIPPET_COLUMNS, _as_utc
+from .youtube_service import VIDEOS_BATCH_SIZE
+
+# Columns only videos.list can fill; search results never carry them
+ENRICHED_COLUMNS = ["duration", "view_count", "like_count", "tags"]
+
+
+class VideoEnricher:
+    """
+    Fills duration, view/like counts and tags on search results.
+
+    Video ids are collected across concurrent requests for a short batch
+    window and fetched with ``videos.list`` in batches of up to 50, instead
+    of one call per video. Details are written to ``youtube_videos`` and kept
+    in an in-process LRU. Unknown videos are awaited; stale ones are served
+    as-is and refreshed in the background.
+    """
+
+    def __init__(
+        self,
+        service,
+        session_factory: Callable = SessionLocal,
+        max_age: float = 24 * 3600,
+        batch_window: float = 0.02,
+        maxsize: int = 4096,
+    ):
+        self.service = service
+        self.session_factory = session_factory
+        self.max_age = max_age
+        self.batch_window = batch_window
+        self.memory = LRUCache(maxsize=maxsize)
+        self.batches = 0
+        self.refreshes = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # Futures and timers belong to one event loop; start clean if it changed
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._reset()
+        return loop
+
+    async def enrich(self, videos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not videos or not self.service.api_key:
+            return videos
+        self._bind_loop()
+
+        ids = list(dict.fromkeys(video['video_id'] for video in videos))
+        known: Dict[str, Tuple[datetime, Dict[str, Any]]] = {}
+        for video_id in ids:
+            entry = self.memory.get(video_id)
+            if entry is not None:
+                known[video_id] = entry
+        missing = [video_id for video_id in ids if video_id not in known]
+        if missing:
+            for video_id, entry in (await asyncio.to_thread(self._load, missing)).items():
+                self.memory.set(video_id, entry)
+                known[video_id] = entry
+
+        now = datetime.now(timezone.utc)
+        stale = [video_id for video_id, (enriched_at, _) in known.items() if self._is_stale(enriched_at, now)]
+        if stale:
+            self.refreshes += sum(1 for video_id in stale if video_id not in self._pending)
+            self._request(stale)
+
+        unknown = [video_id for video_id in ids if video_id not in known]
+        if unknown:
+            # Shielded so a cancelled request does not cancel a batch shared with others
+            fetched = await asyncio.gather(*(asyncio.shield(f) for f in self._request(unknown)))
+            for video_id, values in zip(unknown, fetched):
+                if values is not None:
+                    known[video_id] = (now, values)
+
+        return [
+            {**video, **known[video['video_id']][1]} if video['video_id'] in known else video
+            for video in videos
+        ]
+
+    def _is_stale(self, enriched_at: datetime, now: datetime) -> bool:
+        return enriched_at + timedelta(seconds=self.max_age) < now
+
+    def _request(self, video_ids: List[str]) -> List[asyncio.Future]:
+        loop = self._loop
+        futures = []
+        for video_id in video_ids:
+            future = self._pending.get(video_id)
+            if future is None:
+                future = loop.create_future()
+                self._pending[video_id] = future
+                self._queue.append(video_id)
+            futures.append(future)
+
+        if len(self._queue) >= VIDEOS_BATCH_SIZE:
+            self._flush()
+        elif self._queue and self._timer is None:
+            self._timer = loop.call_later(self.batch_window, self._flush)
+        return futures
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            batch = self._queue[:VIDEOS_BATCH_SIZE]
+            del self._queue[:VIDEOS_BATCH_SIZE]
+            task = self._loop.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[str]) -> None:
+        now = datetime.now(timezone.utc)
+        try:
+            details = await self.service.fetch_video_details(batch)
+            self.batches += 1
+            await asyncio.to_thread(self._store, details, now)
+        except Exception as e:
+            print(f"Error enriching YouTube videos: {e}")
+            details = {}
+
+        for video_id in batch:
+            video = details.get(video_id)
+            values = {column: video.get(column) for column in ENRICHED_COLUMNS} if video else None
+            if values is not None:
+                self.memory.set(video_id, (now, values))
+            future = self._pending.pop(video_id, None)
+            if future is not None and not future.done():
+                future.set_result(values)
+
+    def _load(self, video_ids: List[str]) -> Dict[str, Tuple[datetime, Dict[str, Any]]]:
+        db = self.session_factory()
+        try:
+            rows = db.query(models.YouTubeVideo).filter(
+                models.YouTubeVideo.id.in_(video_ids),
+                models.YouTubeVideo.enriched_at.isnot(None),
+            )
+            return {
+                row.id: (_as_utc(row.enriched_at), {column: getattr(row, column) for column in ENRICHED_COLUMNS})
+                for row in rows
+            }
+        finally:
+            db.close()
+
+    def _store(self, details: Dict[str, Dict[str, Any]], enriched_at: datetime) -> None:
+        rows = [
+            {
+                "id": video_id,
+                **{column: video.get(column) for column in SNIPPET_COLUMNS + ENRICHED_COLUMNS},
+                "enriched_at": enriched_at,
+            }
+            for video_id, video in details.items()
+            if "title" in video
+        ]
+        db = self.session_factory()
+        try:
+            # Snippet columns only matter when the video is new; existing rows keep theirs
+            bulk_upsert(db, models.YouTubeVideo, rows, key_columns=["id"],
+                        update_columns=ENRICHED_COLUMNS + ["enriched_at"])
+            db.commit()
+        finally:
+            db.close()
+
+    async def aclose(self) -> None:
+        """Flush queued ids and wait for in-flight batches (call on shutdown)."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "batches": self.batches,
+            "refreshes": self.refreshes,
+            "pending": len(self._pending),
+        }
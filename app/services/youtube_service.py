@@ -1,50 +1,198 @@
-import os
-import requests
-from typing import List, Optional, Dict, Any
+import asyncio
+import time
+import httpx
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+from ..config import settings
+from .metrics import metrics
+from .youtube_cache import normalize_query
+
+# videos.list accepts at most 50 comma-separated ids per call
+VIDEOS_BATCH_SIZE = 50
+
+
+def parse_video_details(item: Dict[str, Any]) -> Dict[str, Any]:
+    snippet = item.get('snippet', {})
+    statistics = item.get('statistics', {})
+    details = {
+        'video_id': item['id'],
+        'duration': item.get('contentDetails', {}).get('duration'),
+        # Counts arrive as strings and are omitted when the owner hides them
+        'view_count': int(statistics['viewCount']) if 'viewCount' in statistics else None,
+        'like_count': int(statistics['likeCount']) if 'likeCount' in statistics else None,
+        'tags': snippet.get('tags'),
+    }
+    if 'title' in snippet:
+        details.update({
+            'title': snippet['title'],
+            'description': snippet.get('description'),
+            'published_at': datetime.fromisoformat(snippet['publishedAt'].replace('Z', '+00:00')),
+            'channel_id': snippet['channelId'],
+            'channel_title': snippet['channelTitle'],
+            'thumbnail_url': snippet.get('thumbnails', {}).get('high', {}).get('url'),
+        })
+    return details
+
 
 class YouTubeService:
-    def __init__(self, api_key: str):
+    """
+    Async YouTube Data API client.
+
+    Requests go through one pooled ``httpx.AsyncClient`` (keep-alive
+    connections, explicit timeouts) so the event loop is never blocked, and
+    concurrent identical searches are collapsed into a single upstream call.
+    With a ``cache`` (see ``YouTubeSearchCache``), cached searches are served
+    without any network call and fresh results are written back.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        cache=None,
+    ):
         self.api_key = api_key
-        self.base_url = "https://www.googleapis.com/youtube/v3"
+        self.cache = cache
+        self.base_url = base_url or settings.YOUTUBE_API_BASE_URL
+        self.timeout = timeout if timeout is not None else settings.YOUTUBE_TIMEOUT_SECONDS
+        self.max_connections = max_connections or settings.YOUTUBE_MAX_CONNECTIONS
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # The pool's connections belong to the event loop that opened them and can only be closed there
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is not loop:
+            raise RuntimeError(
+                "YouTubeService is bound to another event loop; await aclose() on that loop "
+                "before using the service from a new one"
+            )
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._loop = loop
+            self._inflight = {}
+        return self._client
 
-    def search_videos(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+    async def search_videos(self, query: str, max_results: int = 5, fallback: bool = True) -> List[Dict[str, Any]]:
+        """
+        Search results for ``query``. Upstream errors return mock results
+        unless ``fallback`` is False, in which case they are raised.
+        """
         if not self.api_key:
             # Return mock data if no API key is present (for testing/dev)
             return self._get_mock_videos(query, max_results)
 
+        if self.cache is not None:
+            cached = await self.cache.get(query, max_results)
+            if cached is not None:
+                return list(cached)
+
+        self._get_client()
+        # The cache's key, so queries it treats as one also share one upstream call
+        key = self.cache.key(query, max_results) if self.cache is not None else (normalize_query(query), max_results)
+        task = self._inflight.get(key)
+        if task is None:
+            # Single-flight: later identical callers await the request already on the wire
+            task = asyncio.ensure_future(self._search(query, max_results))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller giving up does not cancel the shared request
         try:
-            params = {
-                'part': 'snippet',
-                'q': query,
-                'type': 'video',
-                'maxResults': max_results,
-                'key': self.api_key
-            }
-            
-            response = requests.get(f"{self.base_url}/search", params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            videos = []
-            for item in data.get('items', []):
-                video_data = {
-                    'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'],
-                    'published_at': datetime.fromisoformat(item['snippet']['publishedAt'].replace('Z', '+00:00')),
-                    'channel_id': item['snippet']['channelId'],
-                    'channel_title': item['snippet']['channelTitle'],
-                    'thumbnail_url': item['snippet']['thumbnails']['high']['url']
-                }
-                videos.append(video_data)
-                
-            return videos
-            
+            return list(await asyncio.shield(task))
         except Exception as e:
+            if not fallback:
+                raise
             print(f"Error searching YouTube: {e}")
             return self._get_mock_videos(query, max_results)
 
+    async def _search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        videos = await self._fetch(query, max_results)
+        if self.cache is not None:
+            try:
+                await self.cache.set(query, max_results, videos)
+            except Exception as e:
+                print(f"Error caching YouTube results: {e}")
+        return videos
+
+    async def _get(self, path: str, params: Dict[str, Any]) -> httpx.Response:
+        # Upstream latency by endpoint, with failures (timeouts, 4xx/5xx) labeled apart
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self._get_client().get(path, params=params)
+            response.raise_for_status()
+            outcome = "ok"
+            return response
+        finally:
+            metrics.observe("app_upstream_duration_seconds", time.perf_counter() - start,
+                            endpoint=path.strip("/"), outcome=outcome)
+
+    async def _fetch(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        params = {
+            'part': 'snippet',
+            'q': query,
+            'type': 'video',
+            'maxResults': max_results,
+            'key': self.api_key
+        }
+
+        response = await self._get("/search", params)
+        data = response.json()
+
+        videos = []
+        for item in data.get('items', []):
+            video_data = {
+                'video_id': item['id']['videoId'],
+                'title': item['snippet']['title'],
+                'description': item['snippet']['description'],
+                'published_at': datetime.fromisoformat(item['snippet']['publishedAt'].replace('Z', '+00:00')),
+                'channel_id': item['snippet']['channelId'],
+                'channel_title': item['snippet']['channelTitle'],
+                'thumbnail_url': item['snippet']['thumbnails']['high']['url']
+            }
+            videos.append(video_data)
+
+        return videos
+
+    async def fetch_video_details(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Statistics, contentDetails and snippet for ``video_ids`` via
+        ``videos.list``, one call per 50 ids. Ids the API does not return
+        (deleted or private videos) are absent from the result. Raises on
+        upstream errors.
+        """
+        details: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(video_ids), VIDEOS_BATCH_SIZE):
+            params = {
+                'part': 'snippet,contentDetails,statistics',
+                'id': ','.join(video_ids[start:start + VIDEOS_BATCH_SIZE]),
+                'key': self.api_key
+            }
+            response = await self._get("/videos", params)
+            for item in response.json().get('items', []):
+                video = parse_video_details(item)
+                details[video['video_id']] = video
+        return details
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.cache.stats() if self.cache is not None else None
+
     def _get_mock_videos(self, query: str, limit: int) -> List[Dict[str, Any]]:
         # Mock data for when API fails or no key
         return [
@@ -0,0 +1,156 @@
+"""
+Local stand-in for the YouTube Data API, for tests and offline development.
+
+Serves ``/search`` and ``/videos`` with deterministic payloads shaped like
+the real API, over HTTP/1.1 keep-alive, and records every request so tests
+can assert how many upstream calls and connections were made.
+
+    python -m app.services.youtube_stub --port 8765
+    YOUTUBE_API_BASE_URL=http://127.0.0.1:8765 uvicorn app.main:app
+"""
+import argparse
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+def stub_video_id(query: str, i: int) -> str:
+    return f"stub_{zlib.crc32(query.encode('utf-8')):08x}_{i}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as two writes; with Nagle on, the body waits for the
+    # client's delayed ACK of the headers (~40 ms) on every keep-alive request
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        stub: "StubYouTubeServer" = self.server.stub
+        stub.record(url.path, params, self.client_address)
+
+        if stub.delay:
+            time.sleep(stub.delay)
+
+        if url.path.endswith("/search"):
+            status, body = 200, stub.search_payload(params)
+        elif url.path.endswith("/videos"):
+            status, body = 200, stub.videos_payload(params)
+        else:
+            status, body = 404, {"error": {"code": 404, "message": "Not found"}}
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubYouTubeServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        self.delay = delay
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, path: str, params: Dict[str, str], client_address) -> None:
+        with self._lock:
+            self.requests.append((path, params))
+            self.connections.add(client_address)
+
+    def calls(self, path_suffix: str) -> List[Dict[str, str]]:
+        with self._lock:
+            return [params for path, params in self.requests if path.endswith(path_suffix)]
+
+    def search_payload(self, params: Dict[str, str]) -> Dict[str, Any]:
+        query = params.get("q", "")
+        max_results = int(params.get("maxResults", 5))
+        return {
+            "items": [
+                {
+                    "id": {"kind": "youtube#video", "videoId": stub_video_id(query, i)},
+                    "snippet": {
+                        "title": f"{query} video {i + 1}",
+                        "description": f"Stub result {i + 1} for {query}",
+                        "publishedAt": "2024-01-01T00:00:00Z",
+                        "channelId": "stub_channel",
+                        "channelTitle": "Stub Channel",
+                        "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{stub_video_id(query, i)}/hqdefault.jpg"}},
+                    },
+                }
+                for i in range(max_results)
+            ]
+        }
+
+    def videos_payload(self, params: Dict[str, str]) -> Dict[str, Any]:
+        ids = [video_id for video_id in params.get("id", "").split(",") if video_id]
+        return {
+            "items": [
+                {
+                    "id": video_id,
+                    "contentDetails": {"duration": "PT10M30S"},
+                    "statistics": {"viewCount": str(1000 + i), "likeCount": str(10 + i)},
+                    "snippet": {
+                        "title": f"Video {video_id}",
+                        "description": f"Stub details for {video_id}",
+                        "publishedAt": "2024-01-01T00:00:00Z",
+                        "channelId": "stub_channel",
+                        "channelTitle": "Stub Channel",
+                        "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+                        "tags": ["stub", video_id],
+                    },
+                }
+                for i, video_id in enumerate(ids)
+            ]
+        }
+
+    def start(self) -> "StubYouTubeServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubYouTubeServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local YouTube Data API stub")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to sleep before each response")
+    args = parser.parse_args(argv)
+
+    stub = StubYouTubeServer(port=args.port, delay=args.delay)
+    print(f"YouTube stub listening on {stub.url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Recall-vs-latency benchmark for the ANN backends against exact search.
+
+Builds the dense (TF-IDF + SVD) text index over synthetic catalogs shaped
+like ``data/catalog.json``, then compares ``IVFIndex`` at several
+``n_probe`` settings with ``BruteForceIndex``:
+
+    python -m benchmarks.ann_recall --sizes 1000 10000 100000 --output ann_recall.json
+"""
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.services.ann_index import BruteForceIndex, IVFIndex
+from app.services.text_index import TextIndex
+
+from .synthetic import generate_catalog
+
+
+def percentile_ms(samples: List[float], q: float) -> float:
+    return float(np.percentile(samples, q) * 1000)
+
+
+def query_vectors(index: TextIndex, queries: List[str]) -> List[np.ndarray]:
+    vectors = [index.query_vector(query) for query in queries]
+    return [q for q in vectors if q is not None]
+
+
+def time_searches(backend, vectors: List[np.ndarray], k: int, **kwargs):
+    latencies, results = [], []
+    for q in vectors:
+        start = time.perf_counter()
+        positions, _ = backend.search(q, k, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        results.append(positions)
+    return latencies, results
+
+
+def run(size: int, components: int, n_queries: int, k: int, n_probes: List[int], seed: int) -> Dict[str, Any]:
+    catalog = generate_catalog(size, seed=seed)
+    start = time.perf_counter()
+    index = TextIndex.build(catalog, n_components=components)
+    index_seconds = time.perf_counter() - start
+
+    rng = random.Random(seed + 1)
+    queries = [" ".join([item["title"]] + item["tags"]) for item in rng.sample(catalog, min(n_queries, size))]
+    vectors = query_vectors(index, queries)
+
+    exact = BruteForceIndex(index.vectors)
+    exact_latencies, exact_results = time_searches(exact, vectors, k)
+
+    start = time.perf_counter()
+    ivf = IVFIndex(index.vectors)
+    ivf_seconds = time.perf_counter() - start
+
+    report = {
+        "size": size,
+        "components": index.vectors.shape[1],
+        "queries": len(vectors),
+        "k": k,
+        "text_index_build_s": index_seconds,
+        "exact": {"p50_ms": percentile_ms(exact_latencies, 50), "p99_ms": percentile_ms(exact_latencies, 99)},
+        "ivf": {"n_lists": ivf.n_lists, "build_s": ivf_seconds, "probes": []},
+    }
+    for n_probe in n_probes:
+        latencies, results = time_searches(ivf, vectors, k, n_probe=n_probe)
+        recall = np.mean([
+            len(set(found.tolist()) & set(truth.tolist())) / max(len(truth), 1)
+            for found, truth in zip(results, exact_results)
+        ])
+        report["ivf"]["probes"].append({
+            "n_probe": n_probe,
+            "recall": float(recall),
+            "p50_ms": percentile_ms(latencies, 50),
+            "p99_ms": percentile_ms(latencies, 99),
+        })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ANN recall vs latency against exact search")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--components", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for size in args.sizes:
+        report = run(size, args.components, args.queries, args.k, args.n_probe, args.seed)
+        reports.append(report)
+        print(f"n={size} exact p50={report['exact']['p50_ms']:.3f}ms p99={report['exact']['p99_ms']:.3f}ms "
+              f"(ivf lists={report['ivf']['n_lists']})")
+        for probe in report["ivf"]["probes"]:
+            print(f"  n_probe={probe['n_probe']:>3} recall@{args.k}={probe['recall']:.3f} "
+                  f"p50={probe['p50_ms']:.3f}ms p99={probe['p99_ms']:.3f}ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
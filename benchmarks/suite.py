@@ -0,0 +1,261 @@
+"""
+End-to-end benchmark suite for the scoring engines and API endpoints.
+
+Three sections, each over synthetic data from ``benchmarks.synthetic``:
+
+* ``catalog``, one entry per ``--catalog-sizes`` value. Times parsing
+  the JSON, compiling and opening the binary catalog, and building the
+  ``CatalogIndex``. Also times per-call ``get_recommendation`` and the
+  Streamlit scorer, ``ScoringEngine.recommend``, for new and repeated
+  profiles. Up to ``--baseline-max`` items it also times the page's
+  original in-script scorer.
+* ``candidates``, one entry per ``--candidate-sizes`` value. Scores a
+  streamed candidates CSV against ``--catalog`` with the vectorized
+  batch predictor. Up to ``--rows-max`` rows it also runs the per-row
+  ``get_recommendation`` path.
+* ``search``: ``POST /api/v1/recommendations/search`` through TestClient,
+  against the local YouTube stub. Uncached queries go upstream; a repeated
+  query is served from the search cache.
+
+Every size from 10^2 to 10^7 is accepted. The catalog section holds the
+catalog in memory, so sizes past 10^6 need tens of GB. Candidate files
+are streamed, so any size fits. Results go to ``--output`` as JSON.
+``--baseline`` compares against an earlier run and lists every timing
+that got worse by more than ``--tolerance``:
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --catalog-sizes 100 1000 --candidate-sizes 100 10000000 --output bench.json
+    python -m benchmarks.suite --output new.json --baseline bench.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from app.services.batch_scoring import BatchScorer
+from app.services.catalog_binary import load_catalog
+from app.services.catalog_cache import CatalogCache
+from app.services.catalog_index import CatalogIndex
+from app.services.profile_cache import ProfileCache
+from app.services.scoring_engine import ScoringEngine
+from generate_predictions import get_recommendation, predict_batch, predict_rows, predict_stream
+
+from .synthetic import CATALOG_PATH, iter_candidates, write_candidates, write_catalog
+from .ui_rerun import script_rerun
+
+POSITION_LEVELS = ["Entry", "Mid", "Senior", "Executive"]
+# Timing changes smaller than this are scheduler noise, not regressions
+NOISE_FLOOR_S = 1e-4
+
+
+def elapsed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def latencies(fn: Callable[[Any], Any], inputs: List[Any]) -> Dict[str, float]:
+    samples = []
+    for value in inputs:
+        start = time.perf_counter()
+        fn(value)
+        samples.append(time.perf_counter() - start)
+    samples = np.array(samples) * 1e3
+    return {
+        "calls": len(samples),
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p99_ms": float(np.percentile(samples, 99)),
+    }
+
+
+def questionnaire_profiles(n: int, seed: int) -> List[Tuple[str, List[str], str]]:
+    """Distinct questionnaire answers drawn from synthetic candidates."""
+    profiles = {}
+    for i, row in enumerate(iter_candidates(n * 4, seed)):
+        skills = [skill for skill in row["languages"].split(";") if skill]
+        profile = (row["expertise"], sorted(skills), POSITION_LEVELS[i % len(POSITION_LEVELS)])
+        profiles.setdefault(repr(profile), profile)
+    return list(profiles.values())[:n]
+
+
+def bench_catalog(size: int, tmpdir: str, sample: int, baseline_max: int, seed: int) -> Dict[str, Any]:
+    json_path = write_catalog(os.path.join(tmpdir, f"catalog_{size}.json"), size, seed)
+    report: Dict[str, Any] = {"size": size, "json_mb": os.path.getsize(json_path) / 2 ** 20}
+
+    def parse():
+        with open(json_path) as f:
+            return json.load(f)
+
+    _, report["json_load_s"] = elapsed(parse)
+    _, report["compile_load_s"] = elapsed(lambda: load_catalog(json_path))
+    catalog, report["binary_load_s"] = elapsed(lambda: load_catalog(json_path))
+    index, report["index_build_s"] = elapsed(lambda: CatalogIndex(catalog))
+
+    candidates = list(iter_candidates(sample, seed))
+    report["get_recommendation"] = latencies(lambda row: get_recommendation(row, index), candidates)
+
+    engine = ScoringEngine(json_path, profiles=ProfileCache(state_path=None, catalogs=CatalogCache()))
+    profiles = questionnaire_profiles(min(sample, 200), seed)
+    _, report["engine_first_call_s"] = elapsed(lambda: engine.recommend(*profiles[0]))
+    report["ui_scorer_new_profile"] = latencies(lambda profile: engine.recommend(*profile), profiles[1:])
+    report["ui_scorer_repeat_profile"] = latencies(lambda profile: engine.recommend(*profile), profiles[1:])
+    if size <= baseline_max:
+        report["ui_scorer_in_script"] = latencies(lambda profile: script_rerun(json_path, *profile), profiles[:20])
+    return report
+
+
+def bench_candidates(size: int, tmpdir: str, catalog_path: str, chunksize: int, rows_max: int,
+                     seed: int) -> Dict[str, Any]:
+    input_path = os.path.join(tmpdir, f"candidates_{size}.csv")
+    output_path = os.path.join(tmpdir, f"predictions_{size}.csv")
+    _, generate_s = elapsed(lambda: write_candidates(input_path, size, seed))
+    catalog = load_catalog(catalog_path)
+    report: Dict[str, Any] = {"size": size, "generate_s": generate_s}
+
+    quiet = partial(predict_stream, report=lambda message: None)
+    _, seconds = elapsed(lambda: quiet(input_path, output_path, partial(predict_batch, scorer=BatchScorer(catalog)),
+                                       chunksize))
+    report["batch_s"] = seconds
+    report["batch_rows_per_s"] = size / seconds
+    if size <= rows_max:
+        _, seconds = elapsed(lambda: quiet(input_path, output_path,
+                                           partial(predict_rows, catalog_index=CatalogIndex(catalog)), chunksize))
+        report["per_row_s"] = seconds
+        report["per_row_rows_per_s"] = size / seconds
+    os.remove(input_path)
+    os.remove(output_path)
+    return report
+
+
+def bench_search(requests: int) -> Dict[str, Any]:
+    """The search endpoint with its YouTube client pointed at the local stub; enrichment is left off."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.routes import recommendations
+    from app.services.youtube_cache import YouTubeSearchCache
+    from app.services.youtube_service import YouTubeService
+    from app.services.youtube_stub import StubYouTubeServer
+
+    original = recommendations.youtube_service, recommendations.video_enricher
+    with StubYouTubeServer() as stub:
+        service = YouTubeService(api_key="bench-key", base_url=stub.url,
+                                 cache=YouTubeSearchCache(maxsize=requests * 2, persist=False))
+        recommendations.youtube_service, recommendations.video_enricher = service, None
+        try:
+            # One event loop for every request, so the service keeps one connection pool
+            with TestClient(app) as client:
+                search = lambda query: client.post("/api/v1/recommendations/search",
+                                                   json={"query": query, "max_results": 5})
+                report = {
+                    "uncached": latencies(search, [f"query {i}" for i in range(requests)]),
+                    "cached": latencies(search, ["query 0"] * requests),
+                    "upstream_calls": len(stub.calls("/search")),
+                }
+                client.portal.call(service.aclose)
+        finally:
+            recommendations.youtube_service, recommendations.video_enricher = original
+    return report
+
+
+def timings(report: Any, prefix: str = "") -> Dict[str, float]:
+    """Flatten a report to ``path -> value`` for its timing and throughput leaves."""
+    flat: Dict[str, float] = {}
+    if isinstance(report, dict):
+        label = f"{prefix}[{report['size']}]" if "size" in report else prefix
+        for key, value in report.items():
+            flat.update(timings(value, f"{label}.{key}" if label else key))
+    elif isinstance(report, list):
+        for value in report:
+            flat.update(timings(value, prefix))
+    elif isinstance(report, (int, float)) and prefix.endswith(("_s", "_ms", "_per_s")):
+        flat[prefix] = float(report)
+    return flat
+
+
+def regressions(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Timings (lower is better) or throughputs (higher is better) worse than the baseline by ``tolerance``."""
+    now, before = timings(current["results"]), timings(baseline["results"])
+    found = []
+    for key in sorted(now.keys() & before.keys()):
+        old, new = before[key], now[key]
+        if not old:
+            continue
+        if key.endswith("_per_s"):
+            change = (old - new) / old
+        else:
+            scale = 1e-3 if key.endswith("_ms") else 1.0
+            if abs(new - old) * scale < NOISE_FLOOR_S:
+                continue
+            change = (new - old) / old
+        if change > tolerance:
+            found.append(f"{key}: {old:.4g} -> {new:.4g} ({change:+.0%} worse)")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark catalog loading, scoring and the search endpoint")
+    parser.add_argument("--catalog-sizes", type=int, nargs="*", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--candidate-sizes", type=int, nargs="*", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--catalog", default=CATALOG_PATH, help="Catalog the candidate predictions score against")
+    parser.add_argument("--sample", type=int, default=500, help="Calls timed per latency measurement")
+    parser.add_argument("--baseline-max", type=int, default=100000,
+                        help="Largest catalog to also time with the original in-script scorer")
+    parser.add_argument("--rows-max", type=int, default=100000,
+                        help="Largest candidate file to also score row by row")
+    parser.add_argument("--chunksize", type=int, default=100000, help="Candidate rows per streamed chunk")
+    parser.add_argument("--search-requests", type=int, default=200, help="Requests per search measurement (0 skips)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this path")
+    parser.add_argument("--baseline", default=None, help="Earlier --output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {"catalog": [], "candidates": []}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.catalog_sizes:
+            report = bench_catalog(size, tmpdir, args.sample, args.baseline_max, args.seed)
+            results["catalog"].append(report)
+            print(f"catalog {size:>9}: json {report['json_load_s']:.3f}s, binary {report['binary_load_s']:.3f}s, "
+                  f"index {report['index_build_s']:.3f}s, get_recommendation "
+                  f"p50={report['get_recommendation']['p50_ms']:.3f}ms, ui new "
+                  f"p50={report['ui_scorer_new_profile']['p50_ms']:.3f}ms, repeat "
+                  f"p50={report['ui_scorer_repeat_profile']['p50_ms']:.3f}ms")
+        for size in args.candidate_sizes:
+            report = bench_candidates(size, tmpdir, args.catalog, args.chunksize, args.rows_max, args.seed)
+            results["candidates"].append(report)
+            per_row = f", per-row {report['per_row_rows_per_s']:,.0f} rows/s" if "per_row_s" in report else ""
+            print(f"candidates {size:>9}: batch {report['batch_rows_per_s']:,.0f} rows/s{per_row}")
+    if args.search_requests:
+        results["search"] = bench_search(args.search_requests)
+        print(f"search: uncached p50={results['search']['uncached']['p50_ms']:.2f}ms, "
+              f"cached p50={results['search']['cached']['p50_ms']:.2f}ms")
+
+    run: Dict[str, Any] = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(run, json.load(f), args.tolerance)
+        print(f"{len(found)} regressions against {args.baseline}" + "".join(f"\n  {line}" for line in found))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Synthetic data shaped like ``data/catalog.json`` and ``test_candidates.csv``.
+
+Values are drawn from the real catalog's categories, levels, providers,
+tags and description vocabulary, and each synthetic item keeps a topic
+(category plus related tags), so text and tag overlap behave like real
+data at any size. Candidates pick their expertise and languages from the
+same topics, with a share of unknown expertise and empty language lists,
+so they match the catalog about as often as real submissions do.
+
+The ``write_*`` helpers stream to disk, so files of 10^7 rows never have
+to fit in memory.
+"""
+import csv
+import json
+import os
+import random
+from typing import Any, Dict, Iterator, List
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "catalog.json")
+
+
+def load_seed_catalog(path: str = CATALOG_PATH) -> List[Dict[str, Any]]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+CANDIDATE_COLUMNS = ["first_name", "last_name", "expertise", "languages", "experience", "role_interest"]
+ROLE_INTERESTS = ["Full-time", "Part-time", "Contract", "Internship"]
+
+
+def generate_catalog(n: int, seed: int = 0, seed_catalog: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Return ``n`` catalog items with the same fields and value domains as the seed catalog."""
+    return list(iter_catalog(n, seed, seed_catalog))
+
+
+def iter_catalog(n: int, seed: int = 0, seed_catalog: List[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    seed_catalog = seed_catalog or load_seed_catalog()
+
+    topics = [
+        (item["category"], item["tags"], item["title"].split(), item["description"].rstrip(".").split())
+        for item in seed_catalog
+    ]
+    levels = sorted({item["position_level"] for item in seed_catalog})
+    difficulties = sorted({item["difficulty"] for item in seed_catalog})
+    providers = sorted({item["provider"] for item in seed_catalog})
+    all_tags = sorted({tag for item in seed_catalog for tag in item["tags"]})
+
+    for i in range(n):
+        category, tags, title_words, description_words = rng.choice(topics)
+        item_tags = rng.sample(tags, rng.randint(1, len(tags)))
+        if rng.random() < 0.3:
+            item_tags.append(rng.choice(all_tags))
+        yield {
+            "id": f"syn{i:08d}",
+            "title": " ".join(rng.sample(title_words, rng.randint(1, len(title_words))) + [str(i)]),
+            "category": category,
+            "difficulty": rng.choice(difficulties),
+            "position_level": rng.choice(levels),
+            "provider": rng.choice(providers),
+            "description": " ".join(rng.choices(description_words, k=rng.randint(6, 14))) + ".",
+            "remote_support": rng.choice(["Yes", "No"]),
+            "adaptive_reasoning": rng.choice(["Yes", "No"]),
+            "tags": list(dict.fromkeys(item_tags)),
+        }
+
+
+def write_catalog(path: str, n: int, seed: int = 0) -> str:
+    """Stream ``n`` synthetic items to ``path`` as one JSON array."""
+    with open(path, "w") as f:
+        f.write("[")
+        for i, item in enumerate(iter_catalog(n, seed)):
+            f.write(",\n" if i else "\n")
+            json.dump(item, f)
+        f.write("\n]\n")
+    return path
+
+
+def iter_candidates(n: int, seed: int = 0, seed_catalog: List[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """``n`` candidate rows with the ``test_candidates.csv`` columns."""
+    rng = random.Random(seed)
+    seed_catalog = seed_catalog or load_seed_catalog()
+    topics = [(item["category"], item["tags"]) for item in seed_catalog]
+    all_tags = sorted({tag for item in seed_catalog for tag in item["tags"]})
+
+    for i in range(n):
+        category, tags = rng.choice(topics)
+        languages = rng.sample(tags, rng.randint(1, len(tags)))
+        if rng.random() < 0.2:
+            languages.append(rng.choice(all_tags))
+        yield {
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            # Some expertise values and language lists match nothing in the catalog
+            "expertise": category if rng.random() < 0.95 else "Unknown",
+            "languages": ";".join(dict.fromkeys(languages)) if rng.random() < 0.95 else "",
+            "experience": rng.randint(0, 20),
+            "role_interest": rng.choice(ROLE_INTERESTS),
+        }
+
+
+def write_candidates(path: str, n: int, seed: int = 0) -> str:
+    """Stream ``n`` synthetic candidates to ``path`` as CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CANDIDATE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(iter_candidates(n, seed))
+    return path
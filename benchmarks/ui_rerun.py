@@ -0,0 +1,110 @@
+"""
+Per-rerun cost of the Streamlit recommendations page.
+
+Streamlit re-executes the whole script on every interaction. The
+``in_script`` baseline repeats what the page used to do on each rerun:
+read ``catalog.json``, score every item in a loop, copy the scored items
+and sort them all. ``engine`` goes through the shared ``ScoringEngine``
+the app holds in ``st.cache_resource``. Its first call pays for the
+catalog load and index build, and later reruns only stat the file and
+read the memoized profile. Each run uses a synthetic catalog of each
+``--sizes`` entry:
+
+    python -m benchmarks.ui_rerun --sizes 1000 100000 --reruns 50 --output ui_rerun.json
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.services.catalog_cache import CatalogCache
+from app.services.profile_cache import ProfileCache
+from app.services.scoring_engine import ScoringEngine
+
+from .synthetic import generate_catalog
+
+PROFILE = ("Data Science", ["Python", "Sales"], "Mid")
+
+
+def script_rerun(catalog_path: str, category: str, skills: List[str], position_level: str) -> List[Dict[str, Any]]:
+    """The page's original in-script scoring, kept as the baseline."""
+    with open(catalog_path, "r") as f:
+        catalog = json.load(f)
+    recommendations = []
+    for item in catalog:
+        score = 0
+        if item.get("category") == category:
+            score += 50
+        if item.get("position_level") == position_level:
+            score += 25
+        tags = item.get("tags", [])
+        for skill in skills:
+            if skill in tags:
+                score += 15
+        score += random.randint(0, 10)
+        if score > 0:
+            match_percentage = min(99, 50 + score) if item.get("category") == category else min(80, 20 + score)
+            item_copy = item.copy()
+            item_copy["match"] = f"{match_percentage}%"
+            item_copy["type"] = "Assessment"
+            recommendations.append(item_copy)
+    recommendations.sort(key=lambda x: int(x["match"].strip('%')), reverse=True)
+    return recommendations[:3]
+
+
+def timings(fn, reruns: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples = np.array(samples) * 1e3
+    return {"p50_ms": float(np.percentile(samples, 50)), "p99_ms": float(np.percentile(samples, 99))}
+
+
+def run(size: int, reruns: int, tmpdir: str) -> Dict[str, Any]:
+    catalog_path = os.path.join(tmpdir, f"catalog_{size}.json")
+    with open(catalog_path, "w") as f:
+        json.dump(generate_catalog(size), f)
+
+    engine = ScoringEngine(catalog_path, profiles=ProfileCache(state_path=None, catalogs=CatalogCache()))
+    start = time.perf_counter()
+    engine.recommend(*PROFILE)
+    first_ms = (time.perf_counter() - start) * 1e3
+
+    return {
+        "size": size,
+        "in_script": timings(lambda: script_rerun(catalog_path, *PROFILE), reruns),
+        "engine_first_ms": first_ms,
+        "engine": timings(lambda: engine.recommend(*PROFILE), reruns),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recommendations page rerun latency, in-script vs shared engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    reports = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.sizes:
+            report = run(size, args.reruns, tmpdir)
+            reports.append(report)
+            print(f"{size:>9} items: in-script p50={report['in_script']['p50_ms']:.2f}ms  "
+                  f"engine p50={report['engine']['p50_ms']:.2f}ms (first call {report['engine_first_ms']:.1f}ms)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,163 @@
+import argparse
 import pandas as pd
-import json
 import os
 import random
+import time
+import multiprocessing
+from collections import deque
+from functools import partial
+
+from app.services.batch_scoring import BatchScorer
+from app.services.catalog_binary import load_catalog as load_compiled_catalog
+from app.services.catalog_index import CatalogIndex
+from app.services.scoring_engine import FALLBACK_TITLE
 
 def load_catalog():
     try:
-        with open('data/catalog.json', 'r') as f:
-            return json.load(f)
+        # Memory-mapped compiled catalog, rebuilt from the JSON when stale
+        return load_compiled_catalog('data/catalog.json')
     except FileNotFoundError:
         print("Catalog not found")
         return []
 
 def get_recommendation(candidate, catalog):
-    recommendations = []
+    # Accept a prebuilt index so batch callers only build it once
+    index = catalog if isinstance(catalog, CatalogIndex) else CatalogIndex(catalog)
     
     user_category = candidate['expertise']
-    user_languages = candidate['languages'].split(';') if pd.notna(candidate['languages']) else []
-    
-    for item in catalog:
-        score = 0
-        
-        # Category match
-        if item.get("category") == user_category:
-            score += 50
-        
-        # Tag match
-        tags = item.get("tags", [])
-        for lang in user_languages:
-            if lang in tags:
-                score += 15
-        
-        # Simple score
-        if score > 0:
-            recommendations.append({
-                "item_title": item["title"],
-                "score": score
-            })
+    user_languages = split_languages(candidate['languages'])
     
-    # Sort by score desc
-    recommendations.sort(key=lambda x: x['score'], reverse=True)
+    # Category match and tag match, scored only over matching items
+    best = index.top_k(1, category=user_category, tags=user_languages)
     
-    if recommendations:
-        return recommendations[0]['item_title']
+    if best:
+        return index.items[best[0][0]]['title']
     else:
-        return "General Software Engineering"
+        return FALLBACK_TITLE
 
-def main():
-    catalog = load_catalog()
-    if not catalog:
-        return
+def split_languages(languages):
+    return languages.split(';') if pd.notna(languages) else []
 
-    candidates = pd.read_csv('test_candidates.csv')
-    
+OUTPUT_COLUMNS = ["firstname", "lastname", "predicted_career_path"]
+DEFAULT_WORKER_CHUNKSIZE = 10000
+
+def predict_rows(candidates, catalog_index):
     results = []
     
     for _, row in candidates.iterrows():
-        top_rec = get_recommendation(row, catalog)
+        top_rec = get_recommendation(row, catalog_index)
         results.append({
             "firstname": row['first_name'],
             "lastname": row['last_name'],
             "predicted_career_path": top_rec
         })
     
-    df_results = pd.DataFrame(results)
+    return pd.DataFrame(results, columns=OUTPUT_COLUMNS)
+
+def predict_batch(candidates, scorer):
+    # Whole-frame scoring: one sparse matrix product instead of a Python loop per row
+    tag_lists = [split_languages(languages) for languages in candidates['languages']]
+    predictions = scorer.recommend(list(candidates['expertise']), tag_lists)
+    
+    return pd.DataFrame({
+        "firstname": candidates['first_name'].values,
+        "lastname": candidates['last_name'].values,
+        "predicted_career_path": predictions
+    })
+
+def write_stream(results, output_file, report=print):
+    # Append each scored chunk as it arrives so memory stays bounded by the chunk size
+    start = time.perf_counter()
+    total = 0
+    header = True
+    
+    with open(output_file, 'w', newline='') as out:
+        for df_chunk in results:
+            df_chunk.to_csv(out, header=header, index=False)
+            header = False
+            total += len(df_chunk)
+            
+            elapsed = time.perf_counter() - start
+            rate = total / elapsed if elapsed > 0 else float('inf')
+            report(f"Scored {total} candidates ({rate:,.0f} rows/s)")
+        
+        if header:
+            out.write(",".join(OUTPUT_COLUMNS) + "\n")
+    
+    return total
+
+def predict_stream(input_file, output_file, predict_chunk, chunksize, report=print):
+    chunks = pd.read_csv(input_file, chunksize=chunksize)
+    return write_stream(map(predict_chunk, chunks), output_file, report)
+
+# Per-process scorer, built once by the pool initializer rather than pickled with every task
+_worker_predict = None
+
+def _init_worker(batch):
+    global _worker_predict
+    catalog = load_catalog()
+    if batch:
+        _worker_predict = partial(predict_batch, scorer=BatchScorer(catalog))
+    else:
+        _worker_predict = partial(predict_rows, catalog_index=CatalogIndex(catalog))
+
+def _predict_in_worker(chunk):
+    return _worker_predict(chunk)
+
+def predict_parallel(input_file, output_file, workers, chunksize, batch=False, report=print):
+    def ordered_results(pool):
+        # Keep a bounded window of shards in flight and yield them back in input order
+        pending = deque()
+        for chunk in pd.read_csv(input_file, chunksize=chunksize):
+            pending.append(pool.apply_async(_predict_in_worker, (chunk,)))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
     
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(batch,)) as pool:
+        return write_stream(ordered_results(pool), output_file, report)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Predict a career path for every candidate")
+    parser.add_argument("--input", default="test_candidates.csv", help="Candidate CSV to score")
     # Save as firstname_lastname.csv (using my name roughly)
-    output_file = "antigravity_agent.csv"
+    parser.add_argument("--output", default="antigravity_agent.csv", help="Where to write predictions")
+    parser.add_argument("--batch", action="store_true", help="Use the vectorized sparse-matrix scorer")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the input in chunks of this many rows instead of loading it whole")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Score chunks across this many processes (implies streaming)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    catalog = load_catalog()
+    if not catalog:
+        return
+
+    output_file = args.output
+    
+    if args.workers > 1:
+        predict_parallel(args.input, output_file, args.workers, args.chunksize or DEFAULT_WORKER_CHUNKSIZE,
+                         batch=args.batch)
+        print(f"Predictions saved to {output_file}")
+        return
+    
+    if args.batch:
+        predict_chunk = partial(predict_batch, scorer=BatchScorer(catalog))
+    else:
+        predict_chunk = partial(predict_rows, catalog_index=CatalogIndex(catalog))
+    
+    if args.chunksize:
+        predict_stream(args.input, output_file, predict_chunk, args.chunksize)
+        print(f"Predictions saved to {output_file}")
+        return
+    
+    candidates = pd.read_csv(args.input)
+    df_results = predict_chunk(candidates)
+    
     df_results.to_csv(output_file, index=False)
     print(f"Predictions saved to {output_file}")
 
@@ -1,9 +1,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import json
 import os
-import random
+
+from app.services.scoring_engine import FALLBACK_RECOMMENDATION, ScoringEngine
 
 # Initialize session state
 if 'show_recommendations' not in st.session_state:
@@ -204,56 +204,65 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Questionnaire definition, built once per process instead of on every rerun
+QUESTIONS = [
+    {
+        "id": "q1",
+        "question": "What is your primary area of expertise?",
+        "type": "selectbox",
+        "options": [
+            "Frontend Development", "Backend Development", "Data Science", "DevOps", "UI/UX Design", "Full Stack",
+            "Banking & Finance", "Healthcare", "Hospitality", "Insurance", "Manufacturing", "Oil & Gas", "Retail", "Telecommunications"
+        ]
+    },
+    {
+        "id": "q2",
+        "question": "Which skills or tools are you proficient in?",
+        "type": "multiselect",
+        "options": [
+            "Python", "JavaScript", "Java", "C++", "Go", "Rust", "TypeScript",
+            "Banking", "Finance", "Healthcare", "Nursing", "Customer Service", "Sales", "Management", "Leadership",
+            "Insurance", "Claims", "Manufacturing", "Operations", "Retail", "Telecommunications", "Network"
+        ]
+    },
+    {
+        "id": "q3",
+        "question": "How many years of experience do you have?",
+        "type": "slider",
+        "min": 0,
+        "max": 20,
+        "value": 2
+    },
+    {
+        "id": "q4",
+        "question": "What type of role are you looking for?",
+        "type": "selectbox",
+        "options": ["Full-time", "Part-time", "Contract", "Internship"]
+    },
+    {
+        "id": "q5",
+        "question": "What position level are you targeting?",
+        "type": "selectbox",
+        "options": ["Entry", "Mid", "Senior", "Executive"]
+    }
+]
+
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), 'data', 'catalog.json')
+
+@st.cache_resource
+def get_scoring_engine():
+    # One engine per server process: the catalog index and profile cache are shared
+    # by every session and rerun instead of being rebuilt by the script
+    return ScoringEngine(CATALOG_PATH)
+
 # Questions Page
 def show_questions():
     st.markdown("## 📝 Assessment Questions")
     st.markdown("Answer these questions to get personalized recommendations for your career path.")
     st.markdown("---")
     
-    questions = [
-        {
-            "id": "q1",
-            "question": "What is your primary area of expertise?",
-            "type": "selectbox",
-            "options": [
-                "Frontend Development", "Backend Development", "Data Science", "DevOps", "UI/UX Design", "Full Stack",
-                "Banking & Finance", "Healthcare", "Hospitality", "Insurance", "Manufacturing", "Oil & Gas", "Retail", "Telecommunications"
-            ]
-        },
-        {
-            "id": "q2",
-            "question": "Which skills or tools are you proficient in?",
-            "type": "multiselect",
-            "options": [
-                "Python", "JavaScript", "Java", "C++", "Go", "Rust", "TypeScript",
-                "Banking", "Finance", "Healthcare", "Nursing", "Customer Service", "Sales", "Management", "Leadership",
-                "Insurance", "Claims", "Manufacturing", "Operations", "Retail", "Telecommunications", "Network"
-            ]
-        },
-        {
-            "id": "q3",
-            "question": "How many years of experience do you have?",
-            "type": "slider",
-            "min": 0,
-            "max": 20,
-            "value": 2
-        },
-        {
-            "id": "q4",
-            "question": "What type of role are you looking for?",
-            "type": "selectbox",
-            "options": ["Full-time", "Part-time", "Contract", "Internship"]
-        },
-        {
-            "id": "q5",
-            "question": "What position level are you targeting?",
-            "type": "selectbox",
-            "options": ["Entry", "Mid", "Senior", "Executive"]
-        }
-    ]
-    
     with st.form("assessment_form"):
-        for q in questions:
+        for q in QUESTIONS:
             st.markdown(f'<div class="question-card">', unsafe_allow_html=True)
             st.subheader(q["question"])
             
@@ -303,73 +312,20 @@ def show_recommendations():
     st.markdown("Based on your responses, here are some learning paths that match your profile:")
     st.markdown("---")
     
-    # Load Catalog
-    catalog_path = os.path.join(os.path.dirname(__file__), 'data', 'catalog.json')
-    catalog = []
+    # User's selected category from Q1
+    user_category = st.session_state.answers.get("q1", "")
+    user_skills = st.session_state.answers.get("q2", [])
+    user_position_level = st.session_state.answers.get("q5", "Entry")
     
+    # Scored by the shared engine; falls back to a general course when nothing matches
+    recommendations = [dict(FALLBACK_RECOMMENDATION)]
     try:
-        if os.path.exists(catalog_path):
-            with open(catalog_path, 'r') as f:
-                catalog = json.load(f)
+        if os.path.exists(CATALOG_PATH):
+            recommendations = get_scoring_engine().recommend(user_category, user_skills, user_position_level, k=3)
         else:
             st.warning("Catalog file not found. Showing sample recommendations.")
     except Exception as e:
         st.error(f"Error loading catalog: {e}")
-        
-    # User's selected category from Q1
-    user_category = st.session_state.answers.get("q1", "")
-    user_skills = st.session_state.answers.get("q2", [])
-    user_position_level = st.session_state.answers.get("q5", "Entry")
-    
-    # Filter and Score Recommendations
-    recommendations = []
-    
-    if catalog:
-        for item in catalog:
-            score = 0
-            # Strong match for category
-            if item.get("category") == user_category:
-                score += 50
-            
-            # Match for position level
-            if item.get("position_level") == user_position_level:
-                score += 25
-            
-            # Match for skills/tags
-            tags = item.get("tags", [])
-            for skill in user_skills:
-                if skill in tags:
-                    score += 15
-            
-            # Add some randomness for variation in generic scores
-            score += random.randint(0, 10)
-            
-            # Only include if there is some relevance or if it's high scoring
-            if score > 0:
-                match_percentage = min(99, 50 + score) if item.get("category") == user_category else min(80, 20 + score)
-                
-                item_copy = item.copy()
-                item_copy["match"] = f"{match_percentage}%"
-                item_copy["type"] = "Assessment" # Default type
-                recommendations.append(item_copy)
-        
-        # Sort by match score (simulated by checking the integer value of the percentage string)
-        recommendations.sort(key=lambda x: int(x["match"].strip('%')), reverse=True)
-        
-        # Take top 3
-        recommendations = recommendations[:3]
-    
-    # Fallback if no catalog or no matches found (shouldn't happen with proper catalog)
-    if not recommendations:
-         recommendations = [
-            {
-                "title": "General Software Engineering",
-                "type": "Course",
-                "provider": "SHL Academy",
-                "match": "80%",
-                "description": "A comprehensive guide to software development principles."
-            }
-        ]
     
     for rec in recommendations:
         with st.expander(f"🎯 {rec['title']} - {rec['match']} Match"):
@@ -11,8 +11,60 @@ def test_search():
     }
     response = client.post("/api/v1/recommendations/search", json=payload)
     print(f"Status Code: {response.status_code}")
+    assert response.status_code == 200
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
+def test_catalog_search():
+    response = client.get("/api/v1/recommendations/catalog", params={"q": "react frontend", "k": 2})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["title"] == "Modern Frontend Development with React"
+
+def test_catalog_videos():
+    response = client.get("/api/v1/recommendations/catalog/shl001/videos", params={"max_results": 2})
+    assert response.status_code == 200
+    assert len(response.json()["videos"]) == 2
+    assert client.get("/api/v1/recommendations/catalog/missing/videos").status_code == 404
+
+def test_users_and_assessments_use_async_sessions():
+    response = client.get("/api/v1/users/", params={"limit": 5})
+    assert response.status_code == 200
+    assert isinstance(response.json()["items"], list)
+    projected = client.get("/api/v1/users/", params={"limit": 1, "fields": "email", "is_active": True})
+    assert all(set(item) == {"id", "email"} for item in projected.json()["items"])
+    assert client.get("/api/v1/users/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/v1/users/", params={"fields": "hashed_password"}).status_code == 400
+    assert client.get("/api/v1/users/999999999").status_code == 404
+    assert client.get("/api/v1/assessments/").status_code == 200
+    assert client.get("/api/v1/assessments/999999999").status_code == 404
+
+def test_batch_recommendations():
+    response = client.post("/api/v1/recommendations/batch", json={"user_ids": [1, 2, 3], "limit": 3})
+    assert response.status_code == 200
+    assert [r["user_id"] for r in response.json()["results"]] == [1, 2, 3]
+    assert client.post("/api/v1/recommendations/batch", json={"user_ids": []}).status_code == 422
+
+def test_profile_recommendations_are_memoized():
+    payload = {"category": "Frontend Development", "skills": ["React", "JavaScript"], "position_level": "Mid", "k": 2}
+    first = client.post("/api/v1/recommendations/profile", json=payload)
+    assert first.status_code == 200
+    assert len(first.json()["results"]) == 2
+    hits = client.get("/api/v1/recommendations/profile/cache").json()["hits"]
+    payload["skills"] = ["JavaScript", "React"]
+    assert client.post("/api/v1/recommendations/profile", json=payload).json() == first.json()
+    assert client.get("/api/v1/recommendations/profile/cache").json()["hits"] == hits + 1
+
+def test_metrics_report_route_latency_caches_and_pools():
+    client.get("/api/v1/recommendations/catalog/shl001/videos", params={"max_results": 1})
+    client.get("/api/v1/recommendations/catalog", params={"q": "python"})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'route="/api/v1/recommendations/catalog/{item_id}/videos"' in body
+    assert 'app_stage_duration_seconds_count{stage="catalog_search"}' in body
+    assert 'app_cache_hit_ratio{cache="catalog"}' in body
+    assert 'app_db_pool_connections{engine="sync"' in body
+
 if __name__ == "__main__":
     try:
         test_search()
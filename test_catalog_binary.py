@@ -0,0 +1,58 @@
+import json
+import os
+
+from app.services.catalog_binary import BinaryCatalog, is_stale, load_catalog
+from app.services.catalog_cache import CatalogCache
+from app.services.catalog_index import CatalogIndex
+
+with open('data/catalog.json', 'r') as f:
+    catalog = json.load(f)
+
+
+def test_compiled_catalog_roundtrip(tmp_path):
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps(catalog))
+
+    compiled = load_catalog(str(json_path))
+    assert isinstance(compiled, BinaryCatalog)
+    assert list(compiled) == catalog
+    assert compiled.column("category") == [item["category"] for item in catalog]
+
+    index = CatalogIndex(compiled)
+    expected = CatalogIndex(catalog)
+    assert index.top_k(3, "Data Science", ["Python"], "Entry") == expected.top_k(3, "Data Science", ["Python"], "Entry")
+
+
+def test_stale_binary_is_rebuilt(tmp_path):
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps(catalog[:2]))
+    assert len(load_catalog(str(json_path))) == 2
+
+    json_path.write_text(json.dumps(catalog[:5]))
+    stat = os.stat(json_path)
+    os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert is_stale(str(json_path), str(tmp_path / "catalog.bin"))
+    assert list(load_catalog(str(json_path))) == catalog[:5]
+
+
+def test_unsupported_catalog_falls_back_to_json(tmp_path):
+    json_path = tmp_path / "catalog.json"
+    items = [dict(catalog[0], rating=4.5)]
+    json_path.write_text(json.dumps(items))
+    assert load_catalog(str(json_path)) == items
+
+
+def test_catalog_cache_reloads_only_on_change(tmp_path):
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps(catalog[:3]))
+    cache = CatalogCache()
+
+    first = cache.get_index(str(json_path))
+    assert cache.get_index(str(json_path)) is first
+    assert (cache.misses, cache.hits, cache.reloads) == (1, 1, 0)
+
+    json_path.write_text(json.dumps(catalog[:4]))
+    assert len(cache.get_index(str(json_path))) == 4
+    assert cache.stats()["reloads"] == 1
+    assert cache.get_item(str(json_path), catalog[3]["id"]) == catalog[3]
+    assert cache.get_item(str(json_path), "missing") is None
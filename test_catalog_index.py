@@ -0,0 +1,73 @@
+import json
+
+import pandas as pd
+
+from app.services.batch_scoring import BatchScorer
+from app.services.catalog_index import CatalogIndex
+from generate_predictions import get_recommendation, predict_batch, predict_parallel, predict_stream
+
+with open('data/catalog.json', 'r') as f:
+    catalog = json.load(f)
+
+
+def linear_scores(category, tags, position_level=None):
+    scores = {}
+    for pos, item in enumerate(catalog):
+        score = 0
+        if item.get("category") == category:
+            score += 50
+        if position_level is not None and item.get("position_level") == position_level:
+            score += 25
+        for tag in tags:
+            if tag in item.get("tags", []):
+                score += 15
+        if score > 0:
+            scores[pos] = score
+    return scores
+
+
+def test_index_matches_linear_scan():
+    index = CatalogIndex(catalog)
+    profiles = [
+        ("Frontend Development", ["JavaScript", "React"], "Mid"),
+        ("Data Science", ["Python", "Python"], None),
+        ("Healthcare", [], "Entry"),
+        ("Unknown", ["NoSuchTag"], None),
+    ]
+    for category, tags, level in profiles:
+        expected = linear_scores(category, tags, level)
+        assert index.score(category, tags, level) == expected
+        ranked = sorted(expected.items(), key=lambda x: x[1], reverse=True)
+        assert index.top_k(3, category, tags, level) == ranked[:3]
+
+
+def test_predictions_unchanged():
+    candidates = pd.read_csv('test_candidates.csv')
+    expected = pd.read_csv('antigravity_agent.csv')
+    index = CatalogIndex(catalog)
+    predicted = [get_recommendation(row, index) for _, row in candidates.iterrows()]
+    assert predicted == list(expected['predicted_career_path'])
+
+
+def test_batch_predictions_unchanged():
+    candidates = pd.read_csv('test_candidates.csv')
+    expected = pd.read_csv('antigravity_agent.csv')
+    predicted = predict_batch(candidates, BatchScorer(catalog))
+    assert predicted.equals(expected)
+
+
+def test_streamed_predictions_unchanged(tmp_path):
+    output = tmp_path / "predictions.csv"
+    scorer = BatchScorer(catalog)
+    total = predict_stream('test_candidates.csv', output, lambda chunk: predict_batch(chunk, scorer),
+                           chunksize=3, report=lambda message: None)
+    assert total == 8
+    assert pd.read_csv(output).equals(pd.read_csv('antigravity_agent.csv'))
+
+
+def test_parallel_predictions_keep_input_order(tmp_path):
+    output = tmp_path / "predictions.csv"
+    total = predict_parallel('test_candidates.csv', output, workers=2, chunksize=2, batch=True,
+                             report=lambda message: None)
+    assert total == 8
+    assert pd.read_csv(output).equals(pd.read_csv('antigravity_agent.csv'))
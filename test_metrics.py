@@ -0,0 +1,40 @@
+from app.services.metrics import Histogram, Metrics, Sample, cache_samples
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    for value in [0.005] * 50 + [0.05] * 45 + [0.5] * 5:
+        histogram.observe(value)
+    assert histogram.count == 100
+    assert histogram.counts == [50, 45, 5, 0]
+    assert histogram.quantile(0.5) == 0.01
+    assert 0.01 < histogram.quantile(0.95) <= 0.1
+    assert 0.1 < histogram.quantile(0.99) <= 1.0
+
+
+def test_render_uses_the_prometheus_text_format():
+    registry = Metrics(buckets=(0.1, 1.0))
+    registry.observe("app_request_duration_seconds", 0.05, route="/a", method="GET", status=200)
+    registry.observe("app_request_duration_seconds", 2.0, route="/a", method="GET", status=200)
+    registry.register_collector(lambda: cache_samples("catalog", {"hits": 3, "misses": 1, "hit_ratio": 0.75, "entries": 1}))
+    registry.register_collector(lambda: 1 / 0)
+    lines = registry.render().splitlines()
+
+    labels = 'method="GET",route="/a",status="200"'
+    assert "# TYPE app_request_duration_seconds histogram" in lines
+    assert f'app_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in lines
+    assert f'app_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f"app_request_duration_seconds_count{{{labels}}} 2" in lines
+    assert f'app_request_duration_seconds_quantile{{{labels},quantile="0.5"}} 0.1' in lines
+    assert 'app_cache_hit_ratio{cache="catalog"} 0.75' in lines
+    assert 'app_cache_entries{cache="catalog"} 1' in lines
+
+
+def test_disabled_registry_is_a_no_op():
+    registry = Metrics(enabled=False)
+    with registry.timer("app_stage_duration_seconds", stage="x"):
+        pass
+    registry.observe("app_stage_duration_seconds", 1.0, stage="x")
+    registry.register_collector(lambda: [Sample("app_cache_hits", {"cache": "c"}, 1)])
+    assert registry.histogram("app_stage_duration_seconds", stage="x") is None
+    assert "app_stage_duration_seconds" not in registry.render()
@@ -0,0 +1,178 @@
+import json
+import math
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.jobs import catalog_ingest, collaborative, item_similarity
+from app.models import models
+from app.models.schemas import RecommendationRequest
+from app.services.recommendation_service import RecommendationService
+
+with open('data/catalog.json', 'r') as f:
+    catalog = json.load(f)
+
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def add_assessments(db, items):
+    for item in items:
+        db.add(models.Assessment(
+            title=item["title"], description=item["description"], category=item["category"],
+            difficulty=item["difficulty"].lower(), duration_minutes=30, questions=[],
+            passing_score=70, tags=item["tags"],
+        ))
+    db.commit()
+
+
+def neighbor_lists(db):
+    lists = {}
+    for rec in db.query(models.Recommendation).order_by(models.Recommendation.score.desc()):
+        lists.setdefault(rec.assessment_id, []).append(rec.recommended_assessment_id)
+    return lists
+
+
+def test_item_similarity_feeds_recommendation_service():
+    db = make_session()
+    add_assessments(db, catalog)
+    assert item_similarity.rebuild(db, top_n=3) > 0
+
+    service = RecommendationService()
+    recs = service.get_recommendations(db, user_id=1, assessment_id=1, limit=3)
+    assert 0 < len(recs) <= 3
+    assert all(rec.recommended_assessment_id != 1 for rec in recs)
+    assert [rec.score for rec in recs] == sorted((rec.score for rec in recs), reverse=True)
+
+    db.add(models.UserAssessment(user_id=7, assessment_id=1, score=80))
+    db.commit()
+    response = service.recommend(db, RecommendationRequest(user_id=7))
+    assert [item.assessment_id for item in response.recommendations] == [rec.recommended_assessment_id for rec in recs]
+
+
+def test_incremental_update_matches_rebuild():
+    db = make_session()
+    add_assessments(db, catalog[:20])
+    item_similarity.rebuild(db, top_n=3)
+
+    add_assessments(db, catalog[20:22])
+    new_ids = [a.id for a in db.query(models.Assessment).filter(models.Assessment.id > 20)]
+    item_similarity.update(db, new_ids, top_n=3)
+    incremental = neighbor_lists(db)
+
+    # Rewritten lists use the grown corpus, exactly as a full rebuild would
+    item_similarity.rebuild(db, top_n=3)
+    rebuilt = neighbor_lists(db)
+    for assessment_id in new_ids:
+        assert incremental[assessment_id] == rebuilt[assessment_id]
+
+
+def test_catalog_ingest_is_idempotent_on_catalog_id():
+    db = make_session()
+    result = catalog_ingest.ingest(db, catalog, batch_size=10)
+    assert (result.rows, result.batches) == (len(catalog), 4)
+    stored = {a.catalog_id: a for a in db.query(models.Assessment)}
+    assert set(stored) == {item["id"] for item in catalog}
+    assert stored["shl001"].difficulty == "intermediate"
+    assert stored["shl001"].tags == catalog[0]["tags"]
+
+    # A rerun with one edited item rewrites only that row
+    edited = [dict(item) for item in catalog]
+    edited[0]["title"] = "React in Depth"
+    catalog_ingest.ingest(db, edited, batch_size=10)
+    db.expire_all()
+    assert db.query(models.Assessment).count() == len(catalog)
+    changed = db.query(models.Assessment).filter(models.Assessment.updated_at.isnot(None)).all()
+    assert [(a.catalog_id, a.title) for a in changed] == [("shl001", "React in Depth")]
+    assert item_similarity.rebuild(db, top_n=3) > 0
+
+
+def add_completions(db, rng, users, n_assessments, per_user):
+    for user_id in users:
+        # Users stick to a band of neighbouring assessments, so pairs recur across users
+        base = rng.randrange(n_assessments)
+        for _ in range(per_user):
+            assessment_id = (base + rng.randrange(6)) % n_assessments + 1
+            db.add(models.UserAssessment(user_id=user_id, assessment_id=assessment_id, score=rng.uniform(40, 100)))
+    db.commit()
+
+
+def collaborative_lists(db):
+    lists = {}
+    rows = db.query(models.Recommendation).filter_by(source="collaborative")
+    for rec in rows.order_by(models.Recommendation.assessment_id, models.Recommendation.score.desc(),
+                             models.Recommendation.recommended_assessment_id):
+        lists.setdefault(rec.assessment_id, []).append((rec.recommended_assessment_id, round(rec.score, 9)))
+    return lists
+
+
+def test_collaborative_incremental_update_matches_rebuild(tmp_path):
+    rng = random.Random(7)
+    db = make_session()
+    add_assessments(db, catalog)
+    add_completions(db, rng, range(1, 151), len(catalog), per_user=4)
+    state_path = str(tmp_path / "state.joblib")
+    assert collaborative.update(db, top_n=5, min_support=2, state_path=state_path) > 0
+
+    # New users, and more completions by users already folded in
+    add_completions(db, rng, range(120, 201), len(catalog), per_user=3)
+    collaborative.update(db, top_n=5, min_support=2, state_path=state_path)
+    incremental = collaborative_lists(db)
+    assert collaborative.update(db, top_n=5, min_support=2, state_path=state_path) == 0
+
+    collaborative.rebuild(db, top_n=5, min_support=2, state_path=str(tmp_path / "fresh.joblib"))
+    assert incremental == collaborative_lists(db)
+    assert item_similarity.rebuild(db, top_n=3) > 0
+    assert collaborative_lists(db) == incremental  # content rebuild leaves collaborative rows alone
+
+    seed = next(iter(incremental))
+    response = RecommendationService().recommend(
+        db, RecommendationRequest(user_id=1, assessment_id=seed, source="collaborative", limit=5),
+    )
+    assert [item.assessment_id for item in response.recommendations] == [col for col, _ in incremental[seed]]
+
+
+def reference_hybrid(db, user_id, weights, limit):
+    completed = {row.assessment_id for row in db.query(models.UserAssessment).filter_by(user_id=user_id)}
+    counts = {}
+    for row in db.query(models.UserAssessment.user_id, models.UserAssessment.assessment_id).distinct():
+        counts[row.assessment_id] = counts.get(row.assessment_id, 0) + 1
+    top = max(counts.values())
+    popularity = {a: math.log1p(c) / math.log1p(top) for a, c in counts.items()}
+
+    scores = {}
+    for seed in completed:
+        for rec in db.query(models.Recommendation).filter_by(assessment_id=seed):
+            weight = weights.content if rec.source == "content" else weights.collaborative
+            scores[rec.recommended_assessment_id] = (
+                scores.get(rec.recommended_assessment_id, 0.0) + weight * rec.score / len(completed)
+            )
+    for assessment_id in set(scores) | set(popularity):
+        scores[assessment_id] = scores.get(assessment_id, 0.0) + weights.popularity * popularity.get(assessment_id, 0.0)
+    ranked = sorted(
+        ((a, s) for a, s in scores.items() if a not in completed and s > 0), key=lambda x: (-x[1], x[0])
+    )
+    return [a for a, _ in ranked[:limit]]
+
+
+def test_score_batch_matches_per_user_reference(tmp_path):
+    rng = random.Random(3)
+    db = make_session()
+    add_assessments(db, catalog)
+    add_completions(db, rng, range(1, 61), len(catalog), per_user=4)
+    item_similarity.rebuild(db, top_n=5)
+    collaborative.rebuild(db, top_n=5, min_support=2, state_path=str(tmp_path / "state.joblib"))
+
+    service = RecommendationService()
+    user_ids = [5, 1, 17, 9999, 5]
+    scored = service.score_batch(db, user_ids, limit=4)
+    assert list(scored) == [5, 1, 17, 9999]
+    for user_id in [5, 1, 17, 9999]:
+        assert [a for a, _ in scored[user_id]] == reference_hybrid(db, user_id, service.weights, 4)
+    # A user without history gets the most popular assessments
+    assert len(scored[9999]) == 4
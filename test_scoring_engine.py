@@ -0,0 +1,154 @@
+import csv
+import json
+
+import pandas as pd
+
+from app.jobs import profile_warmup
+from app.services.catalog_cache import CatalogCache
+from app.services.catalog_index import CatalogIndex
+from app.services.profile_cache import ProfileCache, canonical_profile
+from app.services.scoring_engine import ScoringEngine, jitter
+from generate_predictions import get_recommendation, split_languages
+from test_catalog_index import catalog, linear_scores
+
+
+def write_catalog(tmp_path, items=catalog):
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps(items))
+    return str(json_path)
+
+
+def test_profile_cache_memoizes_canonical_profiles(tmp_path):
+    json_path = write_catalog(tmp_path)
+    cache = ProfileCache(maxsize=2, state_path=None, catalogs=CatalogCache())
+
+    first = cache.get(json_path, "Frontend Development", ["React", "JavaScript"], "Mid")
+    assert dict(zip(first.positions.tolist(), first.scores.tolist())) == \
+        linear_scores("Frontend Development", ["JavaScript", "React"], "Mid")
+    assert cache.get(json_path, "Frontend Development", ["JavaScript", "React", "React"], "Mid") is first
+    assert cache.top_k(json_path, 3, "Frontend Development", ["JavaScript", "React"], "Mid") == \
+        CatalogIndex(catalog).top_k(3, "Frontend Development", ["JavaScript", "React"], "Mid")
+    assert (cache.memory.hits, cache.memory.misses) == (2, 1)
+
+    cache.get(json_path, "Data Science", ["Python"])
+    cache.get(json_path, "Healthcare", [], "Entry")
+    assert cache.memory.evictions == 1
+
+    # A changed catalog is scored afresh rather than served from the old entry
+    write_catalog(tmp_path, catalog[:3])
+    assert max(cache.get(json_path, "Healthcare", [], "Entry").positions.tolist(), default=-1) < 3
+
+    # The LRU is also bounded by the bytes its score arrays take
+    sized = ProfileCache(state_path=None, catalogs=CatalogCache(), max_bytes=first.nbytes + 1)
+    write_catalog(tmp_path)
+    sized.get(json_path, "Frontend Development", ["React", "JavaScript"], "Mid")
+    sized.get(json_path, "Data Science", ["Python"])
+    assert len(sized.memory) == 1 and sized.memory.evictions == 1
+    # Deeper than the pre-ranked prefix, ranked from the score arrays
+    assert sized.top_k(json_path, 60, "Frontend Development", ["JavaScript"], "Mid") == \
+        CatalogIndex(catalog).top_k(60, "Frontend Development", ["JavaScript"], "Mid")
+
+
+def test_profile_warmup_seeds_the_cache(tmp_path):
+    json_path = write_catalog(tmp_path)
+    state_path = str(tmp_path / "profiles.joblib")
+    with open('test_candidates.csv', newline='') as f:
+        counts = profile_warmup.candidate_profiles(csv.DictReader(f), ["Entry", "Mid"])
+    top = [profile for profile, _ in counts.most_common(4)]
+    assert profile_warmup.precompute(json_path, top, state_path) == 4
+
+    cache = ProfileCache(state_path=state_path, catalogs=CatalogCache())
+    category, skills, level = top[0]
+    cache.get(json_path, category, reversed(skills), level)
+    assert cache.stats()["preloaded"] == 4
+    assert (cache.memory.hits, cache.memory.misses) == (1, 0)
+
+    # Scores precomputed for another catalog version are ignored
+    write_catalog(tmp_path, catalog[:3])
+    stale = ProfileCache(state_path=state_path, catalogs=CatalogCache())
+    stale.get(json_path, category, skills, level)
+    assert stale.stats()["preloaded"] == 0
+
+
+def test_scoring_engine_serves_ui_and_batch_from_one_index(tmp_path):
+    json_path = write_catalog(tmp_path)
+    catalogs = CatalogCache()
+    engine = ScoringEngine(json_path, profiles=ProfileCache(state_path=None, catalogs=catalogs))
+
+    candidates = pd.read_csv('test_candidates.csv')
+    index = CatalogIndex(catalog)
+    for _, row in candidates.iterrows():
+        assert engine.best_title(row['expertise'], split_languages(row['languages'])) == get_recommendation(row, index)
+
+    recommendations = engine.recommend("Frontend Development", ["JavaScript", "React"], "Mid")
+    matches = [int(rec["match"].strip('%')) for rec in recommendations]
+    assert len(recommendations) == 3 and matches == sorted(matches, reverse=True)
+    assert all(rec["type"] == "Assessment" for rec in recommendations)
+    engine.recommend("Frontend Development", ["React", "JavaScript"], "Mid")
+    # Every rerun reuses the one catalog index
+    assert (catalogs.misses, catalogs.reloads) == (1, 0)
+
+
+def test_recommendation_bonus_is_deterministic_per_profile(tmp_path):
+    json_path = write_catalog(tmp_path)
+
+    def engine(**options):
+        return ScoringEngine(json_path, profiles=ProfileCache(state_path=None, catalogs=CatalogCache()), **options)
+
+    first, second = engine(), engine()
+    profile = ("Frontend Development", ["JavaScript", "React"], "Mid")
+    expected = first.recommend(*profile)
+    assert first.recommend(*profile) == expected
+    assert second.recommend("Frontend Development", ["React", "JavaScript"], "Mid") == expected
+    assert (first.results.hits, first.results.misses) == (1, 1)
+    # Results are the caller's own, down to the tag lists
+    expected[0]["tags"].append("annotated")
+    assert "annotated" not in first.recommend(*profile)[0]["tags"]
+
+    # The bonus varies across profiles and seeds, but stays within its spread
+    profiles = [canonical_profile("Data Science", [skill], "Entry") for skill in ("Python", "Sales", "Go", "Rust")]
+    bonuses = [[jitter(p, item["id"], 10) for item in catalog] for p in profiles]
+    assert len(set(map(tuple, bonuses))) == len(profiles)
+    assert [jitter(profiles[0], item["id"], 10, seed="a") for item in catalog] != bonuses[0]
+    assert all(0 <= bonus <= 10 for row in bonuses for bonus in row)
+
+    # Without the bonus, matches are the index scores alone
+    scores = linear_scores(*profile)
+    by_id = {item["id"]: pos for pos, item in enumerate(catalog)}
+    plain = engine(jitter=0).recommend(*profile)
+    expected_matches = [
+        min(99, 50 + scores[by_id[rec["id"]]]) if rec["category"] == profile[0] else min(80, 20 + scores[by_id[rec["id"]]])
+        for rec in plain
+    ]
+    assert [rec["match"] for rec in plain] == [f"{match}%" for match in expected_matches]
+
+
+def test_recommend_matches_the_per_item_scorer(tmp_path):
+    json_path = write_catalog(tmp_path)
+
+    def reference(category, tags, level, k, spread):
+        profile = canonical_profile(category, tags, level)
+        base = linear_scores(category, sorted(set(tags)), level)
+        ranked = []
+        for pos, item in enumerate(catalog):
+            score = base.get(pos, 0) + jitter(profile, item["id"], spread)
+            if score > 0:
+                match = min(99, 50 + score) if item.get("category") == category else min(80, 20 + score)
+                ranked.append((-match, pos, f"{match}%"))
+        return [(catalog[pos]["title"], match) for _, pos, match in sorted(ranked)[:k]]
+
+    # The last two match fewer than k items, so unmatched items fill the list. With a
+    # bonus of 15 or more an unmatched item can outrank a matched out-of-category one
+    for spread in (10, 40):
+        engine = ScoringEngine(
+            json_path, profiles=ProfileCache(state_path=None, catalogs=CatalogCache()), jitter=spread,
+        )
+        for category, tags, level, k in [
+            ("Frontend Development", ["JavaScript", "React"], "Mid", 3),
+            ("Data Science", ["Python"], None, 5),
+            ("Backend Development", ["Processing"], None, 3),
+            ("Unknown", ["Sales"], None, 4),
+            ("Unknown", [], None, 3),
+        ]:
+            assert [(rec["title"], rec["match"]) for rec in engine.recommend(category, tags, level, k)] == \
+                reference(category, tags, level, k, spread)
@@ -0,0 +1,61 @@
+import json
+
+from app.services.ann_index import BruteForceIndex, IVFIndex
+from app.services.text_index import TextIndex, load_or_build
+
+with open('data/catalog.json', 'r') as f:
+    catalog = json.load(f)
+
+
+def test_search_ranks_matching_descriptions():
+    for n_components in (None, 16):
+        index = TextIndex.build(catalog, n_components)
+        results = index.search("machine learning with python", 2)
+        assert catalog[results[0][0]]["title"] == "Machine Learning A-Z"
+        assert index.search("", 3) == []
+
+
+def test_persisted_index_folds_in_appended_items(tmp_path):
+    catalog_path = tmp_path / "catalog.json"
+    index_path = str(tmp_path / "index.joblib")
+    catalog_path.write_text(json.dumps(catalog[:30]))
+    first = load_or_build(catalog[:30], str(catalog_path), index_path)
+    assert len(first) == 30
+
+    catalog_path.write_text(json.dumps(catalog[:33]))
+    grown = load_or_build(catalog[:33], str(catalog_path), index_path)
+    assert grown.fitted_size == 30 and len(grown) == 33
+    assert TextIndex.load(index_path).ids == [item["id"] for item in catalog[:33]]
+
+
+def test_ivf_matches_exact_search_when_probing_every_list():
+    index = TextIndex.build(catalog, n_components=16)
+    exact = BruteForceIndex(index.vectors)
+    ivf = IVFIndex(index.vectors, n_lists=4, n_probe=4)
+    for item in catalog[:10]:
+        q = index.query_vector(item["title"])
+        assert ivf.search(q, 5)[0].tolist() == exact.search(q, 5)[0].tolist()
+
+    expected = index.search("machine learning with python", 3)
+    index.use_ann("brute")
+    assert index.ann is not None
+    assert index.search("machine learning with python", 3) == expected
+
+
+def test_tied_scores_go_to_the_earliest_positions():
+    copies = [dict(catalog[0], id=f"copy-{i}") for i in range(40)]
+    tied = catalog + copies
+    for n_components in (None, 16):
+        index = TextIndex.build(tied, n_components)
+        results = index.search(catalog[0]["description"], 5)
+        assert [pos for pos, _ in results] == [0] + list(range(len(catalog), len(catalog) + 4))
+        assert len({score for _, score in results}) == 1
+
+
+def test_ann_on_the_sparse_index_warns_and_keeps_exact_search(capsys):
+    index = TextIndex.build(catalog)
+    expected = index.search("machine learning with python", 3)
+    index.use_ann("ivf")
+    assert index.ann is None
+    assert "TEXT_INDEX_COMPONENTS" in capsys.readouterr().out
+    assert index.search("machine learning with python", 3) == expected
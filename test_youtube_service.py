@@ -0,0 +1,235 @@
+import asyncio
+import json
+
+from sqlalchemy.orm import sessionmaker
+
+from app.jobs.youtube_warmup import SEARCH_QUOTA_COST, warm_catalog
+from app.models import models
+from app.models.database import create_db_engine
+from app.services.metrics import metrics
+from app.services.youtube_cache import YouTubeSearchCache
+from app.services.youtube_enrichment import VideoEnricher
+from app.services.youtube_service import YouTubeService
+from app.services.youtube_stub import StubYouTubeServer
+
+
+def test_concurrent_identical_searches_share_one_upstream_call():
+    with StubYouTubeServer(delay=0.2) as stub:
+        service = YouTubeService(api_key="test-key", base_url=stub.url)
+
+        async def run():
+            try:
+                return await asyncio.gather(
+                    *[service.search_videos(query, 3) for query in ("python tutorial", "Python  Tutorial ") * 2],
+                    service.search_videos("python tutorial", 3),
+                    service.search_videos("rust tutorial", 3),
+                )
+            finally:
+                await service.aclose()
+
+        results = asyncio.run(run())
+        assert len(stub.calls("/search")) == 2
+        assert all(r == results[0] for r in results[:5])
+        assert [v["title"] for v in results[0]] == [f"python tutorial video {i}" for i in (1, 2, 3)]
+        assert results[5][0]["title"] == "rust tutorial video 1"
+
+
+def test_sequential_searches_reuse_a_keep_alive_connection():
+    with StubYouTubeServer() as stub:
+        service = YouTubeService(api_key="test-key", base_url=stub.url)
+
+        async def run():
+            try:
+                for query in ("a", "b", "c"):
+                    await service.search_videos(query, 1)
+            finally:
+                await service.aclose()
+
+        asyncio.run(run())
+        assert len(stub.calls("/search")) == 3
+        assert len(stub.connections) == 1
+
+
+def test_service_refuses_a_second_event_loop_until_closed():
+    with StubYouTubeServer() as stub:
+        service = YouTubeService(api_key="test-key", base_url=stub.url)
+
+        async def search():
+            return await service.search_videos("python", 1)
+
+        async def search_and_close():
+            try:
+                return await search()
+            finally:
+                await service.aclose()
+
+        asyncio.run(search_and_close())
+        asyncio.run(search_and_close())  # closed on its loop, so a new loop may open a new pool
+        asyncio.run(search())
+        try:
+            asyncio.run(search())
+        except RuntimeError as e:
+            assert "another event loop" in str(e)
+        else:
+            raise AssertionError("a pool left open on a finished loop was silently replaced")
+        assert len(stub.calls("/search")) == 3
+
+
+def upstream_count(outcome):
+    histogram = metrics.histogram("app_upstream_duration_seconds", endpoint="search", outcome=outcome)
+    return histogram.count if histogram is not None else 0
+
+
+def test_upstream_timeout_falls_back_to_mock_results():
+    errors = upstream_count("error")
+    with StubYouTubeServer(delay=0.5) as stub:
+        service = YouTubeService(api_key="test-key", base_url=stub.url, timeout=0.05)
+
+        async def run():
+            try:
+                return await service.search_videos("slow", 2)
+            finally:
+                await service.aclose()
+
+        videos = asyncio.run(run())
+        assert [v["video_id"] for v in videos] == ["mock_0", "mock_1"]
+        # The timed-out call is still timed, under its own outcome label
+        assert upstream_count("error") == errors + 1
+
+
+def make_session_factory(tmp_path):
+    # A file database: cache writes run on worker threads, each with its own pooled connection
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'youtube.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def test_cached_searches_skip_upstream_and_survive_restart(tmp_path):
+    session_factory = make_session_factory(tmp_path)
+    with StubYouTubeServer() as stub:
+        async def run(cache):
+            service = YouTubeService(api_key="test-key", base_url=stub.url, cache=cache)
+            try:
+                first = await service.search_videos("Python Tutorial", 3)
+                again = await service.search_videos("  python   tutorial ", 3)
+                return first, again
+            finally:
+                await service.aclose()
+
+        cache = YouTubeSearchCache(maxsize=8, session_factory=session_factory)
+        first, again = asyncio.run(run(cache))
+        assert len(stub.calls("/search")) == 1
+        assert [v["video_id"] for v in again] == [v["video_id"] for v in first]
+        assert cache.stats()["memory"]["hits"] == 1
+
+        # A fresh process starts with an empty memory tier and falls through to the database
+        restarted = YouTubeSearchCache(maxsize=8, session_factory=session_factory)
+        _, again = asyncio.run(run(restarted))
+        assert len(stub.calls("/search")) == 1
+        assert [v["title"] for v in again] == [v["title"] for v in first]
+        assert restarted.stats()["db_hits"] == 1
+        assert restarted.stats()["hit_ratio"] == 1.0
+
+
+def test_search_cache_evicts_least_recently_used():
+    with StubYouTubeServer() as stub:
+        cache = YouTubeSearchCache(maxsize=1, persist=False)
+        service = YouTubeService(api_key="test-key", base_url=stub.url, cache=cache)
+
+        async def run():
+            try:
+                for query in ("a", "b", "a"):
+                    await service.search_videos(query, 1)
+            finally:
+                await service.aclose()
+
+        asyncio.run(run())
+        assert len(stub.calls("/search")) == 3
+        stats = cache.stats()["memory"]
+        assert stats["evictions"] == 2
+        assert stats["size"] == 1
+
+
+def test_enrichment_batches_ids_across_concurrent_requests(tmp_path):
+    session_factory = make_session_factory(tmp_path)
+    with StubYouTubeServer() as stub:
+        service = YouTubeService(api_key="test-key", base_url=stub.url)
+        enricher = VideoEnricher(service, session_factory=session_factory)
+
+        async def search(query):
+            return await enricher.enrich(await service.search_videos(query, 3))
+
+        async def run():
+            try:
+                first = await asyncio.gather(*[search(q) for q in ("python", "rust", "go")])
+                again = await search("python")
+                return first, again
+            finally:
+                await enricher.aclose()
+                await service.aclose()
+
+        first, again = asyncio.run(run())
+        videos = stub.calls("/videos")
+        assert len(videos) == 1
+        assert len(videos[0]["id"].split(",")) == 9
+        assert all(v["duration"] == "PT10M30S" and v["view_count"] >= 1000 for r in first for v in r)
+        assert again == first[0]
+
+        db = session_factory()
+        try:
+            rows = db.query(models.YouTubeVideo).all()
+            assert len(rows) == 9
+            assert all(row.enriched_at is not None and row.tags for row in rows)
+        finally:
+            db.close()
+
+
+def test_enrichment_splits_large_batches_and_refreshes_stale_entries(tmp_path):
+    session_factory = make_session_factory(tmp_path)
+    with StubYouTubeServer() as stub:
+        service = YouTubeService(api_key="test-key", base_url=stub.url)
+        enricher = VideoEnricher(service, session_factory=session_factory, max_age=0)
+
+        async def run():
+            try:
+                videos = await service.search_videos("bulk", 60)
+                enriched = await enricher.enrich(videos)
+                # Stale entries are returned immediately and refreshed in the background
+                stale = await enricher.enrich(videos[:5])
+                await enricher.aclose()
+                return enriched, stale
+            finally:
+                await service.aclose()
+
+        enriched, stale = asyncio.run(run())
+        batches = [len(params["id"].split(",")) for params in stub.calls("/videos")]
+        assert batches == [50, 10, 5]
+        assert all(v["like_count"] is not None for v in enriched + stale)
+        assert enricher.stats()["refreshes"] == 5
+
+
+def test_warmup_respects_quota_and_resumes(tmp_path):
+    with open("data/catalog.json") as f:
+        catalog = json.load(f)[:6]
+    session_factory = make_session_factory(tmp_path)
+    with StubYouTubeServer() as stub:
+        def run(quota):
+            service = YouTubeService(api_key="test-key", base_url=stub.url)
+            # A fresh memory tier each run, as in a new process
+            cache = YouTubeSearchCache(session_factory=session_factory)
+
+            async def warm():
+                try:
+                    return await warm_catalog(catalog, service, cache, quota=quota, concurrency=3, rate=0)
+                finally:
+                    await service.aclose()
+
+            return asyncio.run(warm())
+
+        first = run(quota=3 * SEARCH_QUOTA_COST)
+        assert (first.warmed, first.skipped, first.remaining) == (3, 0, 3)
+        assert first.quota_used == 3 * SEARCH_QUOTA_COST
+
+        second = run(quota=10000)
+        assert (second.warmed, second.skipped, second.remaining) == (3, 3, 0)
+        assert len(stub.calls("/search")) == 6